@@ -3,13 +3,14 @@ Base adapter — all source scrapers extend this.
 """
 import hashlib
 import logging
-import random
 import re
 import time
 from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
+from xml.etree import ElementTree
 
 import requests
 from bs4 import BeautifulSoup
@@ -17,12 +18,23 @@ from bs4 import BeautifulSoup
 from config import (
     CATEGORY_MAP,
     EMPLOYMENT_TYPE_MAP,
+    EARLY_STOP_PAGES,
+    HEADLESS_PAGE_POOL_SIZE,
+    HTML_PARSER_BACKEND,
+    LISTING_PAGE_WORKERS,
+    MAX_LISTINGS,
     MAX_RETRIES,
-    RATE_LIMIT_SECONDS,
     REQUEST_TIMEOUT,
-    RETRY_BACKOFF,
-    USER_AGENTS,
 )
+from extract import ExtractionSpec
+from htmlparse import TargetScanner, parse as parse_with_backend
+from httpcache import CachedResponse, cache_key, get_cache
+from jsonstream import decode_chunks, iter_array_items
+from ratelimit import get_concurrency, get_rate_limiter, host_of
+from recorder import get_recorder, replaying
+from redirects import get_apply_url_resolver
+from retry import RetryLater, attempts_left, backoff_delay, deferred_attempt, get_circuit_breaker, is_retryable
+from transport import HEADLESS, HTTP, get_transport_memory, get_wire_stats, new_session
 
 logger = logging.getLogger(__name__)
 
@@ -70,6 +82,45 @@ class JobDetail:
     tags: str = ""
 
 
+class EarlyStop:
+    """
+    Early-stop check for one paginated crawl. unchanged_ids(listings) -> ids of those stored
+    with the same title, company and posted date; should_stop() turns True once `pages`
+    consecutive pages, counted from first_page, held nothing but such jobs (feeds are
+    newest-first, so past that point there is only old stock).
+    """
+
+    def __init__(self, unchanged_ids, pages: int = EARLY_STOP_PAGES, first_page: int = 0):
+        self.unchanged_ids = unchanged_ids
+        self.pages = max(1, pages)
+        self.first_page = first_page
+        # page -> whether it held only unchanged jobs (None: no listings)
+        self._finished: dict[int, bool | None] = {}
+
+    def should_stop(self, listings: list[JobListing], page: int) -> bool:
+        """
+        Record page number `page` and say whether to stop. Pages may arrive out of order: only
+        the unbroken run of finished pages from first_page counts, so a later page that lands
+        first can't stop the crawl while newer, lower pages are still in flight.
+        """
+        if self.unchanged_ids is None:
+            return False
+        if listings:
+            ids = {str(l.source_job_id) for l in listings}
+            self._finished[page] = ids <= self.unchanged_ids(listings)
+        else:
+            self._finished[page] = None
+        run = 0
+        page = self.first_page
+        while page in self._finished:
+            if self._finished[page] is not None:
+                run = run + 1 if self._finished[page] else 0
+                if run >= self.pages:
+                    return True
+            page += 1
+        return False
+
+
 class BaseAdapter(ABC):
     """Base class for all source adapters."""
 
@@ -77,61 +128,231 @@ class BaseAdapter(ABC):
     BASE_URL: str = ""
     # Set to True for sources that block simple HTTP (403); uses Playwright headless browser
     USE_HEADLESS: bool = False
+    # Concurrent Stage B workers for this source (None = config.DETAIL_WORKERS)
+    DETAIL_WORKERS: int | None = None
+    # True when detail pages always need a browser (JS-rendered); Stage B then renders whole
+    # batches through the headless page pool. USE_HEADLESS sources switch to that once a 403 is seen.
+    HEADLESS_DETAILS: bool = False
+    # Resource types / hosts headless pages for this source may load despite the global block
+    # lists in config (HEADLESS_BLOCKED_RESOURCE_TYPES, HEADLESS_BLOCKED_HOSTS).
+    HEADLESS_ALLOW: tuple[str, ...] = ()
+    # HTML parser backend (htmlparse.LXML / SELECTOLAX / HTML_PARSER; None = HTML_PARSER_BACKEND)
+    PARSER: str | None = None
+    # Parts of listing / detail pages the adapter reads, as simple selectors ("section.jobs,
+    # div#main"); parse_html(html, regions) builds only those subtrees (see htmlparse)
+    LISTING_REGIONS: str | None = None
+    DETAIL_REGIONS: str | None = None
+    # Elements crawl_detail needs (one selector group each, see htmlparse.TargetSelectors;
+    # DETAIL_SPEC.targets() covers every field); fetch_detail_page stops downloading once all
+    # of them are complete
+    DETAIL_TARGETS: tuple[str, ...] = ()
+    # Detail page fields (see extract.ExtractionSpec), read by detail_from_page
+    DETAIL_SPEC: ExtractionSpec | None = None
+    # Listing pages fetched at once / listings discovered per run (None = config values)
+    LISTING_PAGE_WORKERS: int | None = None
+    MAX_LISTINGS: int | None = None
+    # Rate limit override for BASE_URL's host (None = config / DOMAIN_RATE_LIMITS)
+    RATE_LIMIT_SECONDS: float | None = None
+    RATE_LIMIT_BURST: int | None = None
 
     def __init__(self):
-        self.session = requests.Session()
-        self._last_request_time = 0
+        # Shared connection pools; the session keeps one User-Agent for its lifetime
+        self.session = new_session()
+        self.wire_stats = get_wire_stats()
+        self.rate_limiter = get_rate_limiter()
+        self.concurrency = get_concurrency()
+        # Which transport (HTTP / headless) last worked per host, shared across sources and runs
+        self.transport = get_transport_memory()
+        self.breaker = get_circuit_breaker()
+        # Detail pages rendered ahead of time by prefetch_details(), consumed by fetch()
+        self._prefetched: dict[str, str] = {}
+        # Set by incremental runs: listings -> ids stored unchanged (see early_stop())
+        self.unchanged_ids = None
+        if self.BASE_URL and (self.RATE_LIMIT_SECONDS is not None or self.RATE_LIMIT_BURST is not None):
+            self.rate_limiter.configure(host_of(self.BASE_URL), self.RATE_LIMIT_SECONDS, self.RATE_LIMIT_BURST)
 
     @property
     def name(self) -> str:
         return self.SOURCE_NAME
 
     def _get_headers(self) -> dict:
+        # User-Agent and Accept-Encoding come from the session (see transport.new_session)
         return {
-            "User-Agent": random.choice(USER_AGENTS),
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
             "Accept-Language": "en-US,en;q=0.9",
-            "Accept-Encoding": "gzip, deflate",
-            "Connection": "keep-alive",
         }
 
-    def _rate_limit(self):
-        elapsed = time.time() - self._last_request_time
-        if elapsed < RATE_LIMIT_SECONDS:
-            time.sleep(RATE_LIMIT_SECONDS - elapsed)
-        self._last_request_time = time.time()
+    def _rate_limit(self, url: str):
+        """Wait for a token from the shared per-domain limiter. Call right before each network request."""
+        if replaying():
+            return
+        self.rate_limiter.acquire(url)
+
+    def _request_slot(self, url: str):
+        """AIMD in-flight slot plus rate-limit token for one request; record the status on it."""
+        return self.concurrency.slot(url, self.rate_limiter)
+
+    def fetch(self, url: str, headless: bool = True, **kwargs) -> requests.Response | None:
+        """
+        Fetch a URL with retries and rate limiting. On 403, uses headless browser if USE_HEADLESS is True
+        (headless=False keeps a request on plain HTTP, e.g. for feeds a browser can't return raw).
+        Only retryable failures (see retry.is_retryable) are retried, with jittered backoff that
+        honors Retry-After; inside retry.deferred_retries() a retryable failure raises RetryLater
+        instead of sleeping. Returns None at once while the host's circuit breaker is open.
+        With the HTTP cache enabled, fresh entries skip the network entirely and stale ones are
+        revalidated with a conditional request. Under --record/--replay the response is saved/served.
+        """
+        recorder = get_recorder()
+        if recorder and recorder.replaying:
+            return recorder.load_response("http", cache_key(url, kwargs.get("params")))
+        resp = self._fetch(url, headless=headless, **kwargs)
+        if recorder and resp is not None and not kwargs.get("stream"):
+            recorder.save(
+                "http", cache_key(url, kwargs.get("params")), resp.text, resp.status_code, getattr(resp, "headers", None)
+            )
+        return resp
 
-    def fetch(self, url: str, **kwargs) -> requests.Response | None:
-        """Fetch a URL with retries and rate limiting. On 403, uses headless browser if USE_HEADLESS is True."""
-        self._rate_limit()
-        for attempt in range(MAX_RETRIES):
+    def _fetch(self, url: str, headless: bool = True, **kwargs) -> requests.Response | None:
+        html = self._take_prefetched(url)
+        if html:
+            from headless import HeadlessResponse
+            return HeadlessResponse(html, status_code=200, url=url)
+
+        cache = get_cache()
+        key = cached = None
+        if cache and not kwargs.get("stream"):
+            key = cache_key(url, kwargs.get("params"))
+            hit, cached = cache.lookup(key)
+            if hit:
+                return hit
+
+        host = host_of(url)
+        if not self.breaker.allow(host):
+            logger.debug(f"[{self.SOURCE_NAME}] Circuit open for {host}, skipping {url}")
+            return None
+
+        # Hosts known to 403 plain requests go straight to the browser
+        use_headless = self.USE_HEADLESS and headless
+        # Set once the browser failed on this URL: plain HTTP gets one go (and, if it works,
+        # switches the host back to HTTP), but a 403 doesn't render the page a second time
+        browser_failed = False
+        if use_headless and self.transport.prefers_headless(host):
+            resp = self._fetch_headless(url, key)
+            if resp:
+                self.breaker.record_success(host)
+                return resp
+            self.breaker.record_failure(host)
+            if self.breaker.is_open(host):
+                return None
+            browser_failed = True
+
+        deferred = deferred_attempt()
+        attempts = range(deferred, deferred + 1) if deferred is not None else range(MAX_RETRIES)
+        for attempt in attempts:
             try:
-                resp = self.session.get(
-                    url,
-                    headers=self._get_headers(),
-                    timeout=REQUEST_TIMEOUT,
-                    **kwargs,
-                )
+                headers = self._get_headers()
+                if cached:
+                    headers.update(cached.validators())
+                with self._request_slot(url) as slot:
+                    resp = self.session.get(
+                        url,
+                        headers=headers,
+                        timeout=REQUEST_TIMEOUT,
+                        **kwargs,
+                    )
+                    slot.record(resp.status_code)
+                if resp.status_code == 304 and cached:
+                    self.breaker.record_success(host)
+                    return cache.revalidated_response(cached)
                 # If blocked (403) and this adapter uses headless, try Playwright once
-                if resp.status_code == 403 and getattr(self, "USE_HEADLESS", False):
+                if resp.status_code == 403 and use_headless and not browser_failed:
                     logger.info(f"[{self.SOURCE_NAME}] Got 403, trying headless browser for {url}")
-                    from headless import fetch_html, HeadlessResponse
-                    html = fetch_html(url, timeout_ms=REQUEST_TIMEOUT * 1000)
-                    if html:
-                        return HeadlessResponse(html, status_code=200, url=url)
+                    resp.close()  # hand a streamed response's connection back before rendering
+                    headless_resp = self._fetch_headless(url, key)
+                    if headless_resp:
+                        self.breaker.record_success(host)
+                        return headless_resp
+                    self.breaker.record_failure(host)
+                    logger.warning(f"[{self.SOURCE_NAME}] Headless browser failed for {url} after 403")
+                    return None
                 resp.raise_for_status()
+                self.breaker.record_success(host)
+                if not kwargs.get("stream"):
+                    self.wire_stats.record(resp)
+                if use_headless:
+                    self.transport.record(host, HTTP)
+                if key:
+                    cache.store(key, resp.text, url=resp.url, headers=resp.headers)
                 return resp
             except requests.RequestException as e:
-                wait = RETRY_BACKOFF ** attempt
+                if not is_retryable(e):
+                    # The host answered; this URL just won't work
+                    self.breaker.record_success(host)
+                    logger.warning(f"[{self.SOURCE_NAME}] Not retrying {url}: {e}")
+                    return None
+                self.breaker.record_failure(host)
+                if not attempts_left(attempt) or self.breaker.is_open(host):
+                    break
+                wait = backoff_delay(attempt, e)
+                if deferred is not None:
+                    raise RetryLater(url, wait, str(e)) from e
                 logger.warning(
                     f"[{self.SOURCE_NAME}] Attempt {attempt+1}/{MAX_RETRIES} failed for {url}: {e}. "
-                    f"Retrying in {wait}s..."
+                    f"Retrying in {wait:.1f}s..."
                 )
-                if attempt < MAX_RETRIES - 1:
-                    time.sleep(wait)
+                time.sleep(wait)
         logger.error(f"[{self.SOURCE_NAME}] All retries exhausted for {url}")
         return None
 
+    def _fetch_headless(self, url: str, key: str | None):
+        """Render url in the browser; on success remember the host as headless and cache the page."""
+        from headless import fetch_html, HeadlessResponse
+        # Browser render time says nothing about server load, so leave the status unrecorded
+        with self._request_slot(url):
+            html = fetch_html(url, timeout_ms=REQUEST_TIMEOUT * 1000, allow=self.HEADLESS_ALLOW)
+        if not html:
+            return None
+        self.transport.record(host_of(url), HEADLESS)
+        if key:
+            get_cache().store(key, html, url=url)
+        return HeadlessResponse(html, status_code=200, url=url)
+
+    def renders_details_headless(self) -> bool:
+        """Whether Stage B should render this source's detail pages through the page pool."""
+        return self.HEADLESS_DETAILS or bool(
+            self.USE_HEADLESS and self.transport.strategy(host_of(self.BASE_URL)) == HEADLESS
+        )
+
+    def detail_batch_size(self) -> int:
+        """How many listings one Stage B task handles (a page pool's worth when rendering headless)."""
+        if self.renders_details_headless():
+            return HEADLESS_PAGE_POOL_SIZE
+        return 1
+
+    def prefetch_details(self, listings: list[JobListing]):
+        """
+        Render a batch of detail pages concurrently in the headless page pool so the following
+        crawl_detail calls find them ready. No-op for sources fetched over plain HTTP.
+        """
+        listings = [l for l in listings if self.needs_detail_page(l)]
+        if len(listings) < 2 or not self.renders_details_headless():
+            return
+        from headless import fetch_many
+        pages = fetch_many(
+            [l.url for l in listings if l.url not in self._prefetched],
+            timeout_ms=REQUEST_TIMEOUT * 1000,
+            throttle=self._rate_limit,
+            allow=self.HEADLESS_ALLOW,
+        )
+        self._prefetched.update({url: html for url, html in pages.items() if html})
+
+    def needs_detail_page(self, listing: JobListing) -> bool:
+        """False when Stage A already gathered everything crawl_detail needs (nothing to prefetch)."""
+        return True
+
+    def _take_prefetched(self, url: str) -> str | None:
+        return self._prefetched.pop(url, None)
+
     def fetch_json(self, url: str, **kwargs) -> dict | list | None:
         """Fetch JSON from a URL."""
         resp = self.fetch(url, **kwargs)
@@ -142,8 +363,158 @@ class BaseAdapter(ABC):
                 logger.error(f"[{self.SOURCE_NAME}] Invalid JSON from {url}")
         return None
 
-    def parse_html(self, html: str) -> BeautifulSoup:
-        return BeautifulSoup(html, "html.parser")
+    def fetch_detail_page(self, url: str, **kwargs):
+        """
+        fetch() for detail pages that stops reading the body once every DETAIL_TARGETS group has
+        a complete element; the returned response's .text is the page up to that point (the
+        whole page when a target never shows up). Without targets, with the HTTP cache or
+        --record on, or when the page came from the browser, this is plain fetch().
+        Content after the last target is not downloaded, so targets must cover the last
+        element crawl_detail reads.
+        """
+        stream = bool(self.DETAIL_TARGETS) and not get_cache() and not get_recorder()
+        resp = self.fetch(url, stream=stream, **kwargs)
+        if resp is None or not (stream and hasattr(resp, "iter_content")):
+            return resp
+        scanner = TargetScanner(self.DETAIL_TARGETS)
+        parts = []
+        decoded = 0
+
+        def body():
+            nonlocal decoded
+            for chunk in resp.iter_content(chunk_size=16 * 1024):
+                decoded += len(chunk)
+                yield chunk
+
+        with resp:
+            try:
+                for text in decode_chunks(body(), resp.encoding):
+                    parts.append(text)
+                    if scanner.feed(text):
+                        break
+            except requests.RequestException as e:
+                logger.warning(f"[{self.SOURCE_NAME}] Stream from {url} broke off: {e}")
+                return None
+            self.wire_stats.record(resp, decoded)
+        if scanner.done:
+            logger.debug(f"[{self.SOURCE_NAME}] All targets found after {decoded} bytes of {url}")
+        page = CachedResponse("".join(parts), resp.status_code, resp.url, resp.headers)
+        page.from_cache = False
+        return page
+
+    def iter_body_chunks(self, url: str, **kwargs):
+        """
+        Yield the response body for url as bytes chunks straight off the socket, so callers can
+        decode it incrementally. Yields nothing if the fetch fails. The HTTP cache and --record
+        need the full body, so with either on the body is fetched whole and yielded as one chunk.
+        """
+        stream = not get_cache() and not get_recorder()
+        resp = self.fetch(url, stream=stream, **kwargs)
+        if resp is None:
+            return
+        if not (stream and hasattr(resp, "iter_content")):
+            yield resp.content
+            return
+        decoded = 0
+        with resp:
+            try:
+                for chunk in resp.iter_content(chunk_size=64 * 1024):
+                    decoded += len(chunk)
+                    yield chunk
+            except requests.RequestException as e:
+                logger.warning(f"[{self.SOURCE_NAME}] Stream from {url} broke off: {e}")
+            self.wire_stats.record(resp, decoded)
+
+    def iter_json_items(self, url: str, path=(), **kwargs):
+        """
+        Yield the items of the JSON array at path (object keys; () for a top-level array) as
+        they are decoded from the response stream, without holding the whole body in memory.
+        Yields nothing if the fetch fails or the body is empty, and stops (with a warning) if
+        the stream ends mid-document; raises ValueError only if the body has another shape.
+        """
+        chunks = decode_chunks(self.iter_body_chunks(url, **kwargs))
+        first = next(chunks, None)
+        if first is None:
+            return
+        ended = []
+
+        def body():
+            yield first
+            yield from chunks
+            ended.append(True)
+
+        try:
+            yield from iter_array_items(body(), path)
+        except ValueError:
+            # Decoding ran into the end of the body: a cut-off download, not a different shape
+            if not ended:
+                raise
+            logger.warning(f"[{self.SOURCE_NAME}] JSON from {url} ended before the array was complete")
+
+    def iter_xml_elements(self, url: str, tag: str, **kwargs):
+        """
+        Yield each complete <tag> element (e.g. RSS "item") while the document streams in.
+        Elements are cleared after the caller is done with them, so memory stays flat.
+        Yields nothing if the fetch fails; raises ElementTree.ParseError on malformed XML.
+        """
+        parser = ElementTree.XMLPullParser(events=("end",))
+        fed = False
+        for chunk in self.iter_body_chunks(url, **kwargs):
+            parser.feed(chunk)
+            fed = True
+            for _, elem in parser.read_events():
+                if elem.tag == tag:
+                    yield elem
+                    elem.clear()
+        if fed:
+            parser.close()
+
+    def detail_from_page(self, listing: JobListing, soup) -> JobDetail:
+        """Run DETAIL_SPEC over a parsed detail page and build the JobDetail (see build_detail)."""
+        return self.build_detail(listing, self.DETAIL_SPEC.extract(soup, self.BASE_URL))
+
+    def build_detail(self, listing: JobListing, values: dict) -> JobDetail:
+        """
+        JobDetail from extracted values keyed by JobDetail field; title, company, location,
+        posted date and employment type fall back to the listing. employment_type is
+        normalized, salary_text parsed with extract_salary and tags (a list) comma-joined.
+        """
+        salary = self.extract_salary(values.get("salary_text", ""))
+        employment_type = values.get("employment_type")
+        apply_url = values.get("apply_url_original", "")
+        return JobDetail(
+            source=self.SOURCE_NAME,
+            source_job_id=str(listing.source_job_id),
+            title=values.get("title") or listing.title,
+            company_name=values.get("company_name") or listing.company,
+            company_logo_url=values.get("company_logo_url", ""),
+            description_html=values.get("description_html", ""),
+            description_text=values.get("description_text", ""),
+            employment_type=(
+                self.normalize_employment_type(employment_type) if employment_type
+                else listing.employment_type or "Full-time"
+            ),
+            remote_scope="Anywhere",
+            location_text=values.get("location_text") or listing.location,
+            category=listing.category or "Other",
+            salary_min=salary["salary_min"],
+            salary_max=salary["salary_max"],
+            salary_currency=salary["salary_currency"],
+            salary_period=salary["salary_period"],
+            salary_text=salary["salary_text"],
+            posted_at=values.get("posted_at") or str(listing.posted_date or ""),
+            apply_url_original=apply_url,
+            apply_url_final=apply_url,
+            canonical_url=listing.url,
+            tags=",".join(values.get("tags", [])),
+        )
+
+    def parse_html(self, html: str, regions: str | None = None) -> BeautifulSoup:
+        """
+        Parse with the adapter's PARSER backend (see htmlparse; selectolax returns a soup-like
+        shim). With regions, only those subtrees are built (whole document if none matches).
+        """
+        return parse_with_backend(html, self.PARSER or HTML_PARSER_BACKEND, regions)
 
     def normalize_category(self, raw) -> str:
         if not raw:
@@ -173,20 +544,17 @@ class BaseAdapter(ABC):
             normalized += f"|{desc_clean}"
         return hashlib.sha256(normalized.encode()).hexdigest()[:32]
 
+    def is_own_url(self, url: str) -> bool:
+        """Whether url is on this source's site (its job pages need no redirect resolution)."""
+        host = host_of(url).removeprefix("www.")
+        own = host_of(self.BASE_URL).removeprefix("www.")
+        return bool(own) and (host == own or host.endswith("." + own))
+
     def resolve_apply_url(self, url: str) -> str:
-        """Follow redirects to get the final apply URL."""
+        """Follow redirects to get the final apply URL (cached; see redirects.ApplyUrlResolver)."""
         if not url:
             return ""
-        try:
-            resp = self.session.head(
-                url,
-                headers=self._get_headers(),
-                timeout=10,
-                allow_redirects=True,
-            )
-            return resp.url
-        except Exception:
-            return url
+        return get_apply_url_resolver().resolve(url)
 
     def clean_text(self, text: str) -> str:
         """Clean up text content."""
@@ -250,7 +618,107 @@ class BaseAdapter(ABC):
         """Stage A: Discover job listing URLs."""
         ...
 
-    @abstractmethod
+    def iter_listing_batches(self):
+        """
+        Stage A as a stream: yield lists of listings as they are discovered so Stage B can
+        start early. Paginated sources override this; by default it is one crawl_listings() batch.
+        """
+        yield self.crawl_listings()
+
+    def fetch_many_pages(self, urls: list[str], parse_page) -> list[list]:
+        """
+        Fetch listing pages concurrently (up to LISTING_PAGE_WORKERS at once, each request still
+        going through the domain limiter) and parse each one in its worker with
+        parse_page(url, response) -> list. Returns the parsed lists in the order of urls, with
+        [] for pages that failed, so callers merge and dedupe exactly as a serial loop would.
+        """
+        def _one(url):
+            resp = self.fetch(url)
+            return parse_page(url, resp) if resp else []
+
+        return self.map_listing_pages(_one, urls)
+
+    def map_listing_pages(self, func, items: list) -> list:
+        """func(item) for every item on up to LISTING_PAGE_WORKERS threads; results in item order."""
+        workers = max(1, min(len(items), self.LISTING_PAGE_WORKERS or LISTING_PAGE_WORKERS))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{self.SOURCE_NAME}-pages") as pool:
+            return list(pool.map(func, items))
+
+    def early_stop(self, first_page: int = 0) -> EarlyStop:
+        """
+        Fresh early-stop tracker for one paginated crawl whose pages are numbered from
+        first_page. Never stops unless the run set unchanged_ids (incremental mode), so full
+        runs still walk every page.
+        """
+        return EarlyStop(self.unchanged_ids, first_page=first_page)
+
+    def iter_offset_pages(self, fetch_page, page_size: int, total: int | None = None, first_offset: int = 0):
+        """
+        Offset pagination engine. Calls fetch_page(offset) -> list of items (or None on failure)
+        for offsets first_offset, first_offset + page_size, ... with up to LISTING_PAGE_WORKERS
+        requests in flight (each still goes through the domain limiter), and yields
+        (offset, items) in completion order. With total known, exactly the needed offsets are
+        fetched; otherwise paging stops at the first short or empty page. Never goes past
+        MAX_LISTINGS items.
+        """
+        ceiling = self.MAX_LISTINGS or MAX_LISTINGS
+        end = min(total, ceiling) if total is not None else ceiling
+        workers = max(1, self.LISTING_PAGE_WORKERS or LISTING_PAGE_WORKERS)
+        next_offset = first_offset
+        stop_at = end  # lowered when a short page shows where the feed ends
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{self.SOURCE_NAME}-pages") as pool:
+            pending = {}
+            while True:
+                while len(pending) < workers and next_offset < stop_at:
+                    pending[pool.submit(fetch_page, next_offset)] = next_offset
+                    next_offset += page_size
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    offset = pending.pop(future)
+                    items = future.result()
+                    if items is None:
+                        logger.warning(f"[{self.SOURCE_NAME}] Listing page at offset {offset} failed")
+                        if total is None:
+                            # Can't tell a dead page from the end of the feed
+                            stop_at = min(stop_at, offset)
+                        continue
+                    if len(items) < page_size:
+                        stop_at = min(stop_at, offset + len(items))
+                    if items and offset < stop_at:
+                        yield offset, items[:end - offset]
+
     def crawl_detail(self, listing: JobListing) -> JobDetail | None:
-        """Stage B: Extract full job details from a job page."""
-        ...
+        """
+        Stage B: Extract full job details. Split into detail_from_listing (data Stage A already
+        has), fetch_detail_html (I/O) and parse_detail (CPU) so that main can run the parsing in
+        a worker process (see parsepool); adapters override those rather than this.
+        """
+        detail = self.detail_from_listing(listing)
+        if detail:
+            return detail
+        html = self.fetch_detail_html(listing)
+        if not html:
+            return None
+        return self.parse_detail(listing, html)
+
+    def splits_detail(self) -> bool:
+        """Whether crawl_detail is the split default (an adapter may still override it whole)."""
+        return type(self).crawl_detail is BaseAdapter.crawl_detail
+
+    def detail_from_listing(self, listing: JobListing) -> JobDetail | None:
+        """The JobDetail when the listing (e.g. an API record) already holds it; None to fetch the page."""
+        return None
+
+    def fetch_detail_html(self, listing: JobListing) -> str | None:
+        """The detail page's HTML (see fetch_detail_page), or None if it couldn't be fetched."""
+        resp = self.fetch_detail_page(listing.url)
+        return resp.text if resp else None
+
+    def parse_detail(self, listing: JobListing, html: str) -> JobDetail | None:
+        """
+        JobDetail from the detail page's HTML, via DETAIL_SPEC. May run in another process:
+        it must depend only on html and the listing's dataclass fields (not _extra).
+        """
+        return self.detail_from_page(listing, self.parse_html(html, self.DETAIL_REGIONS))
@@ -4,104 +4,145 @@ Site: https://himalayas.app
 Uses their public API.
 """
 import logging
-from urllib.parse import urljoin
 
 from adapters.base import BaseAdapter, JobDetail, JobListing
+from extract import BLOCK_TEXT, HTML, ExtractionSpec, Field
 
 logger = logging.getLogger(__name__)
 
+DESCRIPTION = "div[class*='description'], article, div.prose"
+
 
 class HimalayasAdapter(BaseAdapter):
     SOURCE_NAME = "himalayas"
     BASE_URL = "https://himalayas.app"
     API_URL = "https://himalayas.app/jobs/api"
 
+    PAGE_SIZE = 50
+    # Detail page, for jobs without an API description
+    DETAIL_SPEC = ExtractionSpec({
+        "title": Field("h1"),
+        "description_html": Field(DESCRIPTION, read=HTML),
+        "description_text": Field(DESCRIPTION, read=BLOCK_TEXT),
+        "apply_url_original": Field("a[href*='apply'], a[class*='apply']", read="href"),
+    })
+
     def crawl_listings(self) -> list[JobListing]:
+        return [listing for batch in self.iter_listing_batches() for listing in batch]
+
+    def iter_listing_batches(self):
+        """
+        The first page tells us totalCount (and the page size the API actually honors); the
+        remaining offsets are then fetched in parallel and each page is yielded as it arrives.
+        In incremental runs paging stops once pages hold only jobs we already have.
+        """
+        stopper = self.early_stop()
+        first = self.fetch_json(self.API_URL, params={"limit": self.PAGE_SIZE, "offset": 0})
+        if not first:
+            return
+        jobs = first.get("jobs", [])
+        seen: set[str] = set()
+        found = 0
+        batch = self._listings_from_jobs(jobs, seen)
+        found += len(batch)
+        # Check before yielding: once Stage B stores this batch, its jobs would all look known
+        stop = stopper.should_stop(batch, page=0)
+        yield batch
+        if stop:
+            logger.info(f"[{self.SOURCE_NAME}] First page holds only known jobs, stopping")
+            return
+
+        page_size = int(first.get("limit") or 0) or len(jobs) or self.PAGE_SIZE
+        total = first.get("totalCount")
+        total = int(total) if str(total).isdigit() else None
+        if len(jobs) >= page_size:
+            pages = self.iter_offset_pages(self._fetch_jobs_page, page_size, total=total, first_offset=page_size)
+            for offset, jobs in pages:
+                batch = self._listings_from_jobs(jobs, seen)
+                found += len(batch)
+                stop = stopper.should_stop(batch, page=offset // page_size)
+                yield batch
+                if stop:
+                    logger.info(f"[{self.SOURCE_NAME}] Reached known jobs at offset {offset}, stopping")
+                    break
+
+        logger.info(f"[{self.SOURCE_NAME}] Found {found} listings from API (totalCount {total})")
+
+    def _fetch_jobs_page(self, offset: int) -> list | None:
+        data = self.fetch_json(self.API_URL, params={"limit": self.PAGE_SIZE, "offset": offset})
+        return data.get("jobs", []) if data else None
+
+    def _listings_from_jobs(self, jobs: list, seen: set) -> list[JobListing]:
+        """Convert one API page, skipping jobs already seen on another page (the feed can shift while we page)."""
         listings = []
-        offset = 0
-        limit = 50
-
-        while True:
-            params = {"limit": limit, "offset": offset}
-            data = self.fetch_json(self.API_URL, params=params)
-
-            if not data:
-                break
-
-            jobs = data.get("jobs", [])
-            if not jobs:
-                break
-
-            for job in jobs:
-                title = job.get("title", "")
-                company = job.get("companyName", "")
-                company_logo = job.get("companyLogo", "")
-                guid = job.get("guid", "")
-                application_link = job.get("applicationLink", "")
-
-                # Derive source_job_id from guid URL
-                source_job_id = guid.rstrip("/").split("/")[-1] if guid else title.lower().replace(" ", "-")[:50]
-
-                # Location restrictions is a list
-                location_restrictions = job.get("locationRestrictions", [])
-                location = ", ".join(location_restrictions) if location_restrictions else "Anywhere"
-
-                # Categories — use parentCategories first, then categories
-                parent_cats = job.get("parentCategories", [])
-                categories = job.get("categories", [])
-                category_raw = parent_cats[0] if parent_cats else (categories[0].replace("-", " ") if categories else "Other")
-
-                emp_type = job.get("employmentType", "Full Time")
-                posted = job.get("pubDate", "")  # Unix timestamp as int
-                description = job.get("description", "")
-                excerpt = job.get("excerpt", "")
-
-                salary_min = job.get("minSalary")
-                salary_max = job.get("maxSalary")
-                salary_currency = job.get("currency", "USD")
-
-                seniority = job.get("seniority", [])
-                experience_level = seniority[0] if seniority else ""
-
-                canonical_url = guid or application_link
-
-                if not title:
-                    continue
-
-                listing = JobListing(
-                    source=self.SOURCE_NAME,
-                    source_job_id=source_job_id,
-                    url=canonical_url,
-                    title=title,
-                    company=company,
-                    location=location,
-                    category=self.normalize_category(category_raw),
-                    employment_type=self.normalize_employment_type(emp_type),
-                    posted_date=str(posted),
-                )
-                # Store extra metadata for detail phase
-                listing._extra = {
-                    "company_logo": company_logo,
-                    "salary_min": salary_min,
-                    "salary_max": salary_max,
-                    "salary_currency": salary_currency,
-                    "description": description,
-                    "excerpt": excerpt,
-                    "apply_url": application_link,
-                    "experience_level": experience_level,
-                }
+        for job in jobs:
+            listing = self._listing_from_job(job)
+            if listing and listing.source_job_id not in seen:
+                seen.add(listing.source_job_id)
                 listings.append(listing)
+        return listings
 
-            offset += limit
-            if len(jobs) < limit:
-                break
-            if offset >= 500:
-                break
+    def _listing_from_job(self, job: dict) -> JobListing | None:
+        title = job.get("title", "")
+        company = job.get("companyName", "")
+        company_logo = job.get("companyLogo", "")
+        guid = job.get("guid", "")
+        application_link = job.get("applicationLink", "")
 
-        logger.info(f"[{self.SOURCE_NAME}] Found {len(listings)} listings from API")
-        return listings
+        # Derive source_job_id from guid URL
+        source_job_id = guid.rstrip("/").split("/")[-1] if guid else title.lower().replace(" ", "-")[:50]
+
+        # Location restrictions is a list
+        location_restrictions = job.get("locationRestrictions", [])
+        location = ", ".join(location_restrictions) if location_restrictions else "Anywhere"
+
+        # Categories — use parentCategories first, then categories
+        parent_cats = job.get("parentCategories", [])
+        categories = job.get("categories", [])
+        category_raw = parent_cats[0] if parent_cats else (categories[0].replace("-", " ") if categories else "Other")
+
+        emp_type = job.get("employmentType", "Full Time")
+        posted = job.get("pubDate", "")  # Unix timestamp as int
+        description = job.get("description", "")
+        excerpt = job.get("excerpt", "")
+
+        salary_min = job.get("minSalary")
+        salary_max = job.get("maxSalary")
+        salary_currency = job.get("currency", "USD")
+
+        seniority = job.get("seniority", [])
+        experience_level = seniority[0] if seniority else ""
+
+        canonical_url = guid or application_link
+
+        if not title:
+            return None
 
-    def crawl_detail(self, listing: JobListing) -> JobDetail | None:
+        listing = JobListing(
+            source=self.SOURCE_NAME,
+            source_job_id=source_job_id,
+            url=canonical_url,
+            title=title,
+            company=company,
+            location=location,
+            category=self.normalize_category(category_raw),
+            employment_type=self.normalize_employment_type(emp_type),
+            posted_date=str(posted),
+        )
+        # Store extra metadata for detail phase
+        listing._extra = {
+            "company_logo": company_logo,
+            "salary_min": salary_min,
+            "salary_max": salary_max,
+            "salary_currency": salary_currency,
+            "description": description,
+            "excerpt": excerpt,
+            "apply_url": application_link,
+            "experience_level": experience_level,
+        }
+        return listing
+
+    def detail_from_listing(self, listing: JobListing) -> JobDetail | None:
         extra = getattr(listing, "_extra", {})
 
         if extra.get("description"):
@@ -143,41 +184,5 @@ class HimalayasAdapter(BaseAdapter):
                 canonical_url=listing.url,
             )
 
-        # Fallback: scrape the detail page
-        resp = self.fetch(listing.url)
-        if not resp:
-            return None
-
-        soup = self.parse_html(resp.text)
-
-        title = listing.title
-        h1 = soup.select_one("h1")
-        if h1:
-            title = h1.get_text(strip=True) or title
-
-        company = listing.company
-        desc_el = soup.select_one("div[class*='description'], article, div.prose")
-        description_html = str(desc_el) if desc_el else ""
-        description_text = desc_el.get_text(separator="\n", strip=True) if desc_el else ""
-
-        apply_url = ""
-        apply_el = soup.select_one("a[href*='apply'], a[class*='apply']")
-        if apply_el:
-            apply_url = apply_el.get("href", "")
-
-        return JobDetail(
-            source=self.SOURCE_NAME,
-            source_job_id=str(listing.source_job_id),
-            title=title,
-            company_name=company,
-            description_html=description_html,
-            description_text=description_text,
-            employment_type=listing.employment_type or "Full-time",
-            remote_scope="Anywhere",
-            location_text=listing.location,
-            category=listing.category or "Other",
-            posted_at=str(listing.posted_date),
-            apply_url_original=apply_url,
-            apply_url_final=apply_url,
-            canonical_url=listing.url,
-        )
+        # Otherwise the detail page is scraped (see DETAIL_SPEC)
+        return None
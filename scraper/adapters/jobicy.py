@@ -7,15 +7,28 @@ import logging
 from urllib.parse import urljoin
 
 from adapters.base import BaseAdapter, JobDetail, JobListing
+from extract import BLOCK_TEXT, HTML, ExtractionSpec, Field
 
 logger = logging.getLogger(__name__)
 
+DESCRIPTION = "div.job-description, div.job-content, article"
+
 
 class JobicyAdapter(BaseAdapter):
     SOURCE_NAME = "jobicy"
     BASE_URL = "https://jobicy.com"
     API_URL = "https://jobicy.com/api/v2/remote-jobs"
 
+    # Detail page, for jobs the API didn't return
+    DETAIL_SPEC = ExtractionSpec({
+        "title": Field("h1"),
+        "company_name": Field("a[href*='/company/'], .company-name"),
+        "company_logo_url": Field("img[class*='logo'], img[src*='logo']", read="src"),
+        "description_html": Field(DESCRIPTION, read=HTML),
+        "description_text": Field(DESCRIPTION, read=BLOCK_TEXT),
+        "apply_url_original": Field("a[href*='apply'], a.apply-btn, a[class*='apply']", read="href", absolute=True),
+    })
+
     def crawl_listings(self) -> list[JobListing]:
         listings = []
 
@@ -67,7 +80,8 @@ class JobicyAdapter(BaseAdapter):
 
         logger.info(f"[{self.SOURCE_NAME}] Found {len(listings)} listings from API")
 
-        # Also try HTML fallback for more jobs
+        # Also try HTML fallback for more jobs (newest first: stop once a page is all known)
+        stopper = self.early_stop(first_page=1)
         for page in range(1, 4):
             resp = self.fetch(f"{self.BASE_URL}/jobs?page={page}")
             if not resp:
@@ -76,6 +90,7 @@ class JobicyAdapter(BaseAdapter):
             soup = self.parse_html(resp.text)
             job_cards = soup.select("article a[href*='/jobs/'], div.job-card a[href*='/jobs/']")
 
+            page_listings = []
             for card in job_cards:
                 href = card.get("href", "")
                 if not href or "/jobs/" not in href:
@@ -89,12 +104,16 @@ class JobicyAdapter(BaseAdapter):
                 if not title:
                     continue
 
-                listings.append(JobListing(
+                page_listings.append(JobListing(
                     source=self.SOURCE_NAME,
                     source_job_id=source_id,
                     url=job_url,
                     title=title,
                 ))
+            listings.extend(page_listings)
+            if stopper.should_stop(page_listings, page=page):
+                logger.info(f"[{self.SOURCE_NAME}] Page {page} holds only known jobs, stopping")
+                break
 
         # Deduplicate
         seen = set()
@@ -106,7 +125,7 @@ class JobicyAdapter(BaseAdapter):
                 unique.append(l)
         return unique
 
-    def crawl_detail(self, listing: JobListing) -> JobDetail | None:
+    def detail_from_listing(self, listing: JobListing) -> JobDetail | None:
         extra = getattr(listing, "_extra", {})
 
         # If we have API data, use it directly
@@ -153,55 +172,5 @@ class JobicyAdapter(BaseAdapter):
                 canonical_url=listing.url,
             )
 
-        # Fallback: scrape detail page
-        resp = self.fetch(listing.url)
-        if not resp:
-            return None
-
-        soup = self.parse_html(resp.text)
-
-        title = listing.title
-        h1 = soup.select_one("h1")
-        if h1:
-            title = h1.get_text(strip=True) or title
-
-        company = listing.company
-        company_el = soup.select_one("a[href*='/company/'], .company-name")
-        if company_el:
-            company = company_el.get_text(strip=True) or company
-
-        logo_url = ""
-        logo_el = soup.select_one("img[class*='logo'], img[src*='logo']")
-        if logo_el:
-            logo_url = logo_el.get("src", "")
-
-        desc_el = soup.select_one("div.job-description, div.job-content, article")
-        description_html = str(desc_el) if desc_el else ""
-        description_text = desc_el.get_text(separator="\n", strip=True) if desc_el else ""
-
-        apply_url = ""
-        apply_el = soup.select_one("a[href*='apply'], a.apply-btn, a[class*='apply']")
-        if apply_el:
-            apply_url = apply_el.get("href", "")
-            if apply_url and not apply_url.startswith("http"):
-                apply_url = urljoin(self.BASE_URL, apply_url)
-
-        fingerprint = self.generate_fingerprint(title, company, description_text)
-
-        return JobDetail(
-            source=self.SOURCE_NAME,
-            source_job_id=listing.source_job_id,
-            title=title,
-            company_name=company,
-            company_logo_url=logo_url,
-            description_html=description_html,
-            description_text=description_text,
-            employment_type=listing.employment_type or "Full-time",
-            remote_scope="Anywhere",
-            location_text=listing.location,
-            category=listing.category or "Other",
-            posted_at=listing.posted_date,
-            apply_url_original=apply_url,
-            apply_url_final=apply_url,
-            canonical_url=listing.url,
-        )
+        # Otherwise the detail page is scraped (see DETAIL_SPEC)
+        return None
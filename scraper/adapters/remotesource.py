@@ -8,17 +8,35 @@ import logging
 import os
 from urllib.parse import urljoin
 
-from adapters.base import BaseAdapter, JobDetail, JobListing
+from adapters.base import BaseAdapter, JobListing
 from bs4 import BeautifulSoup
+from extract import BLOCK_TEXT, HTML, ExtractionSpec, Field
 from headless import fetch_html, with_logged_in_session
 
 logger = logging.getLogger(__name__)
 
+DESCRIPTION = "[class*='description'], .job-description, [class*='content'], .prose, article"
+
 
 class RemoteSourceAdapter(BaseAdapter):
     SOURCE_NAME = "remotesource"
     BASE_URL = "https://www.remotesource.com"
     USE_HEADLESS = True  # Next.js SPA — need browser to render
+    HEADLESS_DETAILS = True
+
+    # The login and "See more" lookups use is_visible(), which needs the real CSS
+    LISTING_ALLOW = ("stylesheet",)
+
+    DETAIL_SPEC = ExtractionSpec({
+        "title": Field("h1"),
+        "company_name": Field("p.text-black, [class*='company'], .break-words p"),
+        "description_html": Field(DESCRIPTION, read=HTML),
+        "description_text": Field(DESCRIPTION, read=BLOCK_TEXT),
+        # Only an <a> has an href: a matching button.apply leaves the apply URL empty
+        "apply_url_original": Field("a[href*='apply'], a.apply, button.apply, a[href*='http']", read="href", absolute=True),
+        "salary_text": Field("[class*='salary'], [class*='compensation']"),
+        "employment_type": Field("[class*='type'], [class*='employment']"),
+    })
 
     def crawl_listings(self) -> list[JobListing]:
         email = os.environ.get("REMOTESOURCE_EMAIL", "").strip()
@@ -53,10 +71,12 @@ class RemoteSourceAdapter(BaseAdapter):
                 return await page.content()
 
             html = with_logged_in_session(
-                self.BASE_URL, email, password, get_listings_page, timeout_ms=90000
+                self.BASE_URL, email, password, get_listings_page, timeout_ms=90000,
+                allow=self.LISTING_ALLOW,
             )
         else:
-            html = fetch_html(self.BASE_URL, timeout_ms=45000)
+            self._rate_limit(self.BASE_URL)
+            html = fetch_html(self.BASE_URL, timeout_ms=45000, allow=self.LISTING_ALLOW)
 
         if not html:
             logger.warning("[remotesource] Failed to load homepage")
@@ -121,64 +141,10 @@ class RemoteSourceAdapter(BaseAdapter):
         )
         return listings
 
-    def crawl_detail(self, listing: JobListing) -> JobDetail | None:
-        # Job detail pages are likely public too
-        html = fetch_html(listing.url, timeout_ms=30000)
+    def fetch_detail_html(self, listing: JobListing) -> str | None:
+        # Job detail pages are likely public too (usually already rendered by prefetch_details)
+        html = self._take_prefetched(listing.url)
         if not html:
-            return None
-
-        soup = self.parse_html(html)
-        title = listing.title
-        company = listing.company
-
-        h1 = soup.select_one("h1")
-        if h1:
-            title = h1.get_text(strip=True) or title
-
-        company_el = soup.select_one("p.text-black, [class*='company'], .break-words p")
-        if company_el:
-            company = company_el.get_text(strip=True) or company
-
-        desc_el = soup.select_one(
-            "[class*='description'], .job-description, [class*='content'], .prose, article"
-        )
-        description_html = str(desc_el) if desc_el else ""
-        description_text = desc_el.get_text(separator="\n", strip=True) if desc_el else ""
-
-        apply_url = ""
-        apply_el = soup.select_one("a[href*='apply'], a.apply, button.apply, a[href*='http']")
-        if apply_el and apply_el.name == "a" and apply_el.get("href"):
-            apply_url = apply_el.get("href", "")
-        if apply_url and not apply_url.startswith("http"):
-            apply_url = urljoin(self.BASE_URL, apply_url)
-
-        salary_info = {"salary_min": None, "salary_max": None, "salary_currency": "USD", "salary_period": "yearly", "salary_text": ""}
-        salary_el = soup.select_one("[class*='salary'], [class*='compensation']")
-        if salary_el:
-            salary_info = self.extract_salary(salary_el.get_text(strip=True))
-
-        emp_type = listing.employment_type or "Full-time"
-        type_el = soup.select_one("[class*='type'], [class*='employment']")
-        if type_el:
-            emp_type = self.normalize_employment_type(type_el.get_text(strip=True))
-
-        return JobDetail(
-            source=self.SOURCE_NAME,
-            source_job_id=listing.source_job_id,
-            title=title,
-            company_name=company,
-            description_html=description_html,
-            description_text=description_text,
-            employment_type=emp_type,
-            remote_scope="Anywhere",
-            location_text=listing.location,
-            category=listing.category or "Other",
-            salary_min=salary_info["salary_min"],
-            salary_max=salary_info["salary_max"],
-            salary_currency=salary_info["salary_currency"],
-            salary_period=salary_info["salary_period"],
-            salary_text=salary_info["salary_text"],
-            apply_url_original=apply_url,
-            apply_url_final=apply_url,
-            canonical_url=listing.url,
-        )
+            self._rate_limit(listing.url)
+            html = fetch_html(listing.url, timeout_ms=30000, allow=self.HEADLESS_ALLOW)
+        return html
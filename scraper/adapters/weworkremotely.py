@@ -4,9 +4,13 @@ Site: https://weworkremotely.com
 """
 import logging
 import re
+from dataclasses import replace
+from email.utils import parsedate_to_datetime
 from urllib.parse import urljoin
+from xml.etree import ElementTree
 
 from adapters.base import BaseAdapter, JobDetail, JobListing
+from extract import BLOCK_TEXT, HTML, TEXT, ExtractionSpec, Field
 
 logger = logging.getLogger(__name__)
 
@@ -21,65 +25,56 @@ CATEGORIES = [
     "remote-jobs/all-other-remote",
 ]
 
+# RSS feed behind each category page: same jobs, each with its full description
+CATEGORY_FEEDS = {
+    "remote-jobs/programming": "categories/remote-programming-jobs.rss",
+    "remote-jobs/design": "categories/remote-design-jobs.rss",
+    "remote-jobs/devops-and-sysadmin": "categories/remote-devops-sysadmin-jobs.rss",
+    "remote-jobs/management-and-finance": "categories/remote-management-and-finance-jobs.rss",
+    "remote-jobs/product": "categories/remote-product-jobs.rss",
+    "remote-jobs/customer-support": "categories/remote-customer-support-jobs.rss",
+    "remote-jobs/sales-and-marketing": "categories/remote-sales-and-marketing-jobs.rss",
+    "remote-jobs/all-other-remote": "categories/remote-all-other-jobs.rss",
+}
+MEDIA_NS = "{http://search.yahoo.com/mrss/}"
+# Detail page job content: the listing container, else the whole show container
+CONTENT = ("div.listing-container", "div#job-listing-show-container")
+APPLY = "div.apply-container a, a.apply-button, a[href*='apply']"
+SALARY = "span.listing-tag.salary, div.salary"
+# Job header/apply section, removed from the job content before anything is read
+HEADER = "div.listing-header-container"
+
 
 class WeWorkRemotelyAdapter(BaseAdapter):
     SOURCE_NAME = "weworkremotely"
     BASE_URL = "https://weworkremotely.com"
     USE_HEADLESS = True  # Site blocks simple HTTP with 403
+    # Discover jobs from the category RSS feeds instead of rendering the category pages; a
+    # category whose feed can't be read falls back to its HTML page. The feed has the whole job
+    # except the employer's apply link and the salary, so Stage B still loads each job page,
+    # but reads only those two fields from it (APPLY_SPEC)
+    USE_FEEDS = True
+    LISTING_REGIONS = "section.jobs"
+    DETAIL_REGIONS = "div#job-listing-show-container, div.listing-container, div.company-card, div.listing-logo"
+    DETAIL_SPEC = ExtractionSpec({
+        "description_html": Field(CONTENT, read=HTML),
+        "description_text": Field(CONTENT, read=BLOCK_TEXT),
+        "company_name": Field("div.company-card h2 a, div.listing-header-container h2"),
+        "company_logo_url": Field("div.listing-logo img", read="src", absolute=True),
+        "apply_url_original": Field(APPLY, read="href", absolute=True),
+        "employment_type": Field("span.listing-tag"),
+        "salary_text": Field(SALARY),
+        "posted_at": Field("time", read=("datetime", TEXT)),
+        "tags": Field("span.listing-tag", many=True),
+    }, remove=(CONTENT, HEADER))
+    APPLY_SPEC = ExtractionSpec({
+        "apply_url_original": Field(APPLY, read="href", absolute=True),
+        "salary_text": Field(SALARY),
+    }, remove=(CONTENT, HEADER))
 
     def crawl_listings(self) -> list[JobListing]:
-        listings = []
-        for category_path in CATEGORIES:
-            url = f"{self.BASE_URL}/{category_path}"
-            resp = self.fetch(url)
-            if not resp:
-                continue
-
-            soup = self.parse_html(resp.text)
-            job_sections = soup.select("section.jobs article ul li")
-
-            for li in job_sections:
-                link = li.select_one("a[href*='/remote-jobs/']")
-                if not link:
-                    continue
-
-                href = link.get("href", "")
-                if not href or href.startswith("#") or "/categories/" in href:
-                    continue
-
-                # Extract source_job_id from URL
-                source_job_id = href.rstrip("/").split("/")[-1]
-                job_url = urljoin(self.BASE_URL, href)
-
-                # Get title
-                title_el = link.select_one("span.title")
-                title = title_el.get_text(strip=True) if title_el else ""
-
-                # Get company
-                company_el = link.select_one("span.company")
-                company = company_el.get_text(strip=True) if company_el else ""
-
-                # Get location/region
-                region_el = link.select_one("span.region")
-                region = region_el.get_text(strip=True) if region_el else "Anywhere"
-
-                if not title:
-                    continue
-
-                # Determine category from URL path
-                cat_name = category_path.split("/")[-1].replace("-", " ").title()
-
-                listings.append(JobListing(
-                    source=self.SOURCE_NAME,
-                    source_job_id=source_job_id,
-                    url=job_url,
-                    title=title,
-                    company=company,
-                    location=region,
-                    category=self.normalize_category(cat_name),
-                ))
-
-            logger.info(f"[{self.SOURCE_NAME}] Found {len(listings)} listings from {category_path}")
+        pages = self.map_listing_pages(self._crawl_category, CATEGORIES)
+        listings = [listing for page in pages for listing in page]
 
         # Deduplicate by URL
         seen = set()
@@ -90,97 +85,168 @@ class WeWorkRemotelyAdapter(BaseAdapter):
                 unique.append(l)
         return unique
 
-    def crawl_detail(self, listing: JobListing) -> JobDetail | None:
-        resp = self.fetch(listing.url)
-        if not resp:
+    def _crawl_category(self, category_path: str) -> list[JobListing]:
+        if self.USE_FEEDS and category_path in CATEGORY_FEEDS:
+            listings = self._crawl_feed(category_path)
+            if listings:
+                return listings
+            logger.info(f"[{self.SOURCE_NAME}] No feed for {category_path}, falling back to HTML")
+        url = f"{self.BASE_URL}/{category_path}"
+        resp = self.fetch(url)
+        return self._parse_category_page(url, resp) if resp else []
+
+    def _crawl_feed(self, category_path: str) -> list[JobListing] | None:
+        """Listings (with the finished JobDetail attached) from one category feed, or None."""
+        url = f"{self.BASE_URL}/{CATEGORY_FEEDS[category_path]}"
+        cat_name = category_path.split("/")[-1].replace("-", " ").title()
+        listings = []
+        try:
+            # A browser can't hand back raw XML, so feeds stay on plain HTTP
+            for item in self.iter_xml_elements(url, "item", headless=False):
+                listing = self._listing_from_feed_item(item, cat_name)
+                if listing:
+                    listings.append(listing)
+        except ElementTree.ParseError as e:
+            logger.warning(f"[{self.SOURCE_NAME}] Unreadable feed {url}: {e}")
+            return None
+        logger.info(f"[{self.SOURCE_NAME}] Found {len(listings)} listings from feed {category_path}")
+        return listings
+
+    def _listing_from_feed_item(self, item, cat_name: str) -> JobListing | None:
+        def text(tag: str) -> str:
+            return (item.findtext(tag) or "").strip()
+
+        job_url = text("link") or text("guid")
+        # Feed titles read "Company: Job title"
+        company, _, title = text("title").partition(": ")
+        if not title:
+            company, title = "", company
+        if not job_url or not title:
             return None
 
-        soup = self.parse_html(resp.text)
-
-        # Job content
-        content_el = soup.select_one("div.listing-container")
-        if not content_el:
-            content_el = soup.select_one("div#job-listing-show-container")
-
-        description_html = ""
-        description_text = ""
-        if content_el:
-            # Remove the header/apply sections to get just the description
-            desc_el = content_el.select_one("div.listing-header-container")
-            if desc_el:
-                desc_el.decompose()
-            description_html = str(content_el)
-            description_text = content_el.get_text(separator="\n", strip=True)
-
-        # Company name
-        company = listing.company
-        company_el = soup.select_one("div.company-card h2 a, div.listing-header-container h2")
-        if company_el:
-            company = company_el.get_text(strip=True) or company
-
-        # Company logo
+        source_job_id = job_url.rstrip("/").split("/")[-1]
+        region = text("region") or "Anywhere"
+        category = self.normalize_category(text("category") or cat_name)
+        type_text = text("type")
+        employment_type = self.normalize_employment_type(type_text.lower()) if type_text else "Full-time"
+
+        posted_at = text("pubDate")
+        try:
+            posted_at = parsedate_to_datetime(posted_at).isoformat()
+        except (TypeError, ValueError):
+            pass
+
+        description_html = text("description")
+        description_text = self.parse_html(description_html).get_text(separator="\n", strip=True)
+
         logo_url = ""
-        logo_el = soup.select_one("div.listing-logo img")
-        if logo_el:
-            logo_url = logo_el.get("src", "")
-            if logo_url and not logo_url.startswith("http"):
-                logo_url = urljoin(self.BASE_URL, logo_url)
-
-        # Apply URL — look for apply button/link
-        apply_url = ""
-        apply_el = soup.select_one("div.apply-container a, a.apply-button, a[href*='apply']")
-        if apply_el:
-            apply_url = apply_el.get("href", "")
-            if apply_url and not apply_url.startswith("http"):
-                apply_url = urljoin(self.BASE_URL, apply_url)
-
-        # Employment type
-        employment_type = listing.employment_type or "Full-time"
-        type_el = soup.select_one("span.listing-tag")
-        if type_el:
-            type_text = type_el.get_text(strip=True).lower()
-            employment_type = self.normalize_employment_type(type_text)
-
-        # Salary
-        salary_info = {"salary_min": None, "salary_max": None, "salary_currency": "USD", "salary_period": "yearly", "salary_text": ""}
-        salary_el = soup.select_one("span.listing-tag.salary, div.salary")
-        if salary_el:
-            salary_info = self.extract_salary(salary_el.get_text(strip=True))
-
-        # Posted date
-        posted_at = listing.posted_date
-        date_el = soup.select_one("time")
-        if date_el:
-            posted_at = date_el.get("datetime", "") or date_el.get_text(strip=True)
-
-        # Tags
-        tags = []
-        tag_els = soup.select("span.listing-tag")
-        for t in tag_els:
-            tags.append(t.get_text(strip=True))
-
-        fingerprint = self.generate_fingerprint(listing.title, company, description_text)
-
-        return JobDetail(
+        media = item.find(f"{MEDIA_NS}content")
+        if media is not None:
+            logo_url = media.get("url", "")
+
+        tags = [t for t in (type_text, text("category")) if t]
+        tags += [skill.strip() for skill in text("skills").split(",") if skill.strip()]
+
+        listing = JobListing(
             source=self.SOURCE_NAME,
-            source_job_id=listing.source_job_id,
-            title=listing.title,
-            company_name=company,
-            company_logo_url=logo_url,
-            description_html=description_html,
-            description_text=description_text,
+            source_job_id=source_job_id,
+            url=job_url,
+            title=title,
+            company=company,
+            location=region,
+            posted_date=posted_at,
             employment_type=employment_type,
-            remote_scope="Anywhere",
-            location_text=listing.location,
-            category=listing.category,
-            salary_min=salary_info["salary_min"],
-            salary_max=salary_info["salary_max"],
-            salary_currency=salary_info["salary_currency"],
-            salary_period=salary_info["salary_period"],
-            salary_text=salary_info["salary_text"],
-            posted_at=posted_at,
+            category=category,
+        )
+        # The feed carries the job; crawl_detail adds the apply link and salary from the job page
+        listing._extra = {
+            "detail": JobDetail(
+                source=self.SOURCE_NAME,
+                source_job_id=source_job_id,
+                title=title,
+                company_name=company,
+                company_logo_url=logo_url,
+                description_html=description_html,
+                description_text=description_text,
+                employment_type=employment_type,
+                remote_scope="Anywhere",
+                location_text=region,
+                category=category,
+                posted_at=posted_at,
+                # No apply link in the feed: the job page, until crawl_detail finds the real one
+                apply_url_original=job_url,
+                apply_url_final=job_url,
+                canonical_url=job_url,
+                tags=",".join(tags),
+            ),
+        }
+        return listing
+
+    def _parse_category_page(self, url: str, resp) -> list[JobListing]:
+        category_path = url.removeprefix(f"{self.BASE_URL}/")
+        listings = []
+
+        soup = self.parse_html(resp.text, self.LISTING_REGIONS)
+        job_sections = soup.select("section.jobs article ul li")
+
+        for li in job_sections:
+            link = li.select_one("a[href*='/remote-jobs/']")
+            if not link:
+                continue
+
+            href = link.get("href", "")
+            if not href or href.startswith("#") or "/categories/" in href:
+                continue
+
+            # Extract source_job_id from URL
+            source_job_id = href.rstrip("/").split("/")[-1]
+            job_url = urljoin(self.BASE_URL, href)
+
+            # Get title
+            title_el = link.select_one("span.title")
+            title = title_el.get_text(strip=True) if title_el else ""
+
+            # Get company
+            company_el = link.select_one("span.company")
+            company = company_el.get_text(strip=True) if company_el else ""
+
+            # Get location/region
+            region_el = link.select_one("span.region")
+            region = region_el.get_text(strip=True) if region_el else "Anywhere"
+
+            if not title:
+                continue
+
+            # Determine category from URL path
+            cat_name = category_path.split("/")[-1].replace("-", " ").title()
+
+            listings.append(JobListing(
+                source=self.SOURCE_NAME,
+                source_job_id=source_job_id,
+                url=job_url,
+                title=title,
+                company=company,
+                location=region,
+                category=self.normalize_category(cat_name),
+            ))
+
+        logger.info(f"[{self.SOURCE_NAME}] Found {len(listings)} listings from {category_path}")
+        return listings
+
+    def crawl_detail(self, listing: JobListing) -> JobDetail | None:
+        detail = getattr(listing, "_extra", {}).get("detail")
+        if detail is None:
+            # Listing from the HTML fallback: scrape the whole page
+            return super().crawl_detail(listing)
+        html = self.fetch_detail_html(listing)
+        if not html:
+            logger.warning(f"[{self.SOURCE_NAME}] No job page for {listing.url}, keeping the feed job without apply link/salary")
+            return detail
+        values = self.APPLY_SPEC.extract(self.parse_html(html, self.DETAIL_REGIONS), self.BASE_URL)
+        apply_url = values.get("apply_url_original") or detail.apply_url_original
+        return replace(
+            detail,
             apply_url_original=apply_url,
             apply_url_final=apply_url,
-            canonical_url=listing.url,
-            tags=",".join(tags) if tags else "",
+            **self.extract_salary(values.get("salary_text", "")),
         )
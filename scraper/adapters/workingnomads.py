@@ -7,60 +7,101 @@ import logging
 from urllib.parse import urljoin
 
 from adapters.base import BaseAdapter, JobDetail, JobListing
+from extract import BLOCK_TEXT, HTML, ExtractionSpec, Field
 
 logger = logging.getLogger(__name__)
 
+DESCRIPTION = "div.description, div.job-description, article, div.content"
+
 
 class WorkingNomadsAdapter(BaseAdapter):
     SOURCE_NAME = "workingnomads"
     BASE_URL = "https://www.workingnomads.com"
     API_URL = "https://www.workingnomads.com/api/exposed_jobs/"
 
-    def crawl_listings(self) -> list[JobListing]:
-        listings = []
+    # Listings handed to Stage B at a time while the API array is still downloading
+    STREAM_BATCH = 50
+    DETAIL_SPEC = ExtractionSpec({
+        "title": Field("h1"),
+        # Longer text is a heading that isn't the company name
+        "company_name": Field(".company-name, a[href*='/company/'], h2", transform=lambda text: text if len(text) < 100 else ""),
+        "company_logo_url": Field("img[class*='logo'], img[alt*='logo']", read="src", absolute=True),
+        "description_html": Field(DESCRIPTION, read=HTML),
+        "description_text": Field(DESCRIPTION, read=BLOCK_TEXT),
+        "apply_url_original": Field("a.apply-btn, a[href*='apply'], a[class*='apply']", read="href", absolute=True),
+    })
 
-        data = self.fetch_json(self.API_URL)
-        if not data:
+    def crawl_listings(self) -> list[JobListing]:
+        return [listing for batch in self.iter_listing_batches() for listing in batch]
+
+    def iter_listing_batches(self):
+        """
+        The API returns every job in one large array: decode it item by item from the response
+        stream and yield listings in batches as they arrive. A failed or empty fetch yields no
+        items and goes straight to the HTML fallback.
+        """
+        found = 0
+        batch = []
+        try:
+            for job in self.iter_json_items(self.API_URL):
+                listing = self._listing_from_job(job) if isinstance(job, dict) else None
+                if listing:
+                    batch.append(listing)
+                if len(batch) >= self.STREAM_BATCH:
+                    found += len(batch)
+                    yield batch
+                    batch = []
+        except ValueError as e:
+            logger.warning(f"[{self.SOURCE_NAME}] Unexpected API response shape: {e}")
+            if not found and not batch:
+                # Not a top-level array (e.g. {"results": [...]}): decode it whole instead
+                batch = self._listings_from_data(self.fetch_json(self.API_URL))
+        if batch:
+            found += len(batch)
+            yield batch
+
+        if found:
+            logger.info(f"[{self.SOURCE_NAME}] Found {found} listings from API")
+        else:
             # Fallback to HTML
-            return self._crawl_listings_html()
+            yield self._crawl_listings_html()
 
+    def _listings_from_data(self, data) -> list[JobListing]:
         if isinstance(data, list):
             jobs = data
         elif isinstance(data, dict):
             jobs = data.get("results", data.get("jobs", []))
         else:
-            return self._crawl_listings_html()
-
-        for job in jobs:
-            source_job_id = str(job.get("id", job.get("slug", "")))
-            title = job.get("title", "")
-            company = job.get("company_name", "")
-            url = job.get("url", "")
-            location = job.get("location", "Remote")
-            category = job.get("category_name", "Other")
-            emp_type = job.get("job_type", "Full-time")
-            posted = job.get("pub_date", "")
-
-            if not title or not url:
-                continue
-
-            if not url.startswith("http"):
-                url = urljoin(self.BASE_URL, url)
+            return []
+        return [listing for listing in map(self._listing_from_job, jobs) if listing]
+
+    def _listing_from_job(self, job: dict) -> JobListing | None:
+        source_job_id = str(job.get("id", job.get("slug", "")))
+        title = job.get("title", "")
+        company = job.get("company_name", "")
+        url = job.get("url", "")
+        location = job.get("location", "Remote")
+        category = job.get("category_name", "Other")
+        emp_type = job.get("job_type", "Full-time")
+        posted = job.get("pub_date", "")
+
+        if not title or not url:
+            return None
 
-            listings.append(JobListing(
-                source=self.SOURCE_NAME,
-                source_job_id=source_job_id,
-                url=url,
-                title=title,
-                company=company,
-                location=location,
-                category=self.normalize_category(category),
-                employment_type=self.normalize_employment_type(emp_type),
-                posted_date=posted,
-            ))
+        if not url.startswith("http"):
+            url = urljoin(self.BASE_URL, url)
 
-        logger.info(f"[{self.SOURCE_NAME}] Found {len(listings)} listings from API")
-        return listings
+        return JobListing(
+            source=self.SOURCE_NAME,
+            source_job_id=source_job_id,
+            url=url,
+            title=title,
+            company=company,
+            location=location,
+            category=self.normalize_category(category),
+            employment_type=self.normalize_employment_type(emp_type),
+            posted_date=posted,
+        )
 
     def _crawl_listings_html(self) -> list[JobListing]:
         """Fallback HTML scraping."""
@@ -94,62 +135,9 @@ class WorkingNomadsAdapter(BaseAdapter):
         logger.info(f"[{self.SOURCE_NAME}] Found {len(listings)} listings from HTML")
         return listings
 
-    def crawl_detail(self, listing: JobListing) -> JobDetail | None:
-        resp = self.fetch(listing.url)
-        if not resp:
-            return None
-
-        soup = self.parse_html(resp.text)
-
-        title = listing.title
-        h1 = soup.select_one("h1")
-        if h1:
-            title = h1.get_text(strip=True) or title
-
-        company = listing.company
-        company_el = soup.select_one(".company-name, a[href*='/company/'], h2")
-        if company_el:
-            txt = company_el.get_text(strip=True)
-            if txt and len(txt) < 100:
-                company = txt or company
-
-        logo_url = ""
-        logo_el = soup.select_one("img[class*='logo'], img[alt*='logo']")
-        if logo_el:
-            src = logo_el.get("src", "")
-            logo_url = urljoin(self.BASE_URL, src) if src else ""
-
-        desc_el = soup.select_one("div.description, div.job-description, article, div.content")
-        description_html = str(desc_el) if desc_el else ""
-        description_text = desc_el.get_text(separator="\n", strip=True) if desc_el else ""
-
-        apply_url = ""
-        apply_el = soup.select_one("a.apply-btn, a[href*='apply'], a[class*='apply']")
-        if apply_el:
-            apply_url = apply_el.get("href", "")
-            if apply_url and not apply_url.startswith("http"):
-                apply_url = urljoin(self.BASE_URL, apply_url)
-
+    def parse_detail(self, listing: JobListing, html: str) -> JobDetail | None:
+        detail = super().parse_detail(listing, html)
         # If no explicit apply, use the job URL itself
-        if not apply_url:
-            apply_url = listing.url
-
-        fingerprint = self.generate_fingerprint(title, company, description_text)
-
-        return JobDetail(
-            source=self.SOURCE_NAME,
-            source_job_id=listing.source_job_id,
-            title=title,
-            company_name=company,
-            company_logo_url=logo_url,
-            description_html=description_html,
-            description_text=description_text,
-            employment_type=listing.employment_type or "Full-time",
-            remote_scope="Anywhere",
-            location_text=listing.location,
-            category=listing.category or "Other",
-            posted_at=listing.posted_date,
-            apply_url_original=apply_url,
-            apply_url_final=apply_url,
-            canonical_url=listing.url,
-        )
+        if not detail.apply_url_original:
+            detail.apply_url_original = detail.apply_url_final = listing.url
+        return detail
@@ -5,12 +5,96 @@ import os
 
 # Database
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "jobs.db")
+DB_BUSY_TIMEOUT = 30  # seconds to wait on a locked database before failing
 
 # Scraper settings
 REQUEST_TIMEOUT = 30
 MAX_RETRIES = 3
 RETRY_BACKOFF = 2  # exponential backoff multiplier
-RATE_LIMIT_SECONDS = 2  # seconds between requests per domain
+RETRY_AFTER_MAX_SECONDS = 300  # longest Retry-After we are willing to wait for
+# Per-host circuit breaker: this many retryable failures in a row stop requests to the host
+# for CIRCUIT_COOLDOWN_SECONDS (then one trial request decides whether it reopens)
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_COOLDOWN_SECONDS = 300
+RATE_LIMIT_SECONDS = 2  # seconds between requests per domain (token refill interval)
+RATE_LIMIT_BURST = 1  # requests a domain may burst before RATE_LIMIT_SECONDS applies
+# Per-host overrides: host -> (seconds between requests, burst). Adapters can also set
+# RATE_LIMIT_SECONDS / RATE_LIMIT_BURST on the class for their BASE_URL host.
+DOMAIN_RATE_LIMITS: dict[str, tuple[float, int]] = {}
+RESPECT_ROBOTS_CRAWL_DELAY = True  # never go faster than a published robots.txt Crawl-delay
+
+# Adaptive (AIMD) per-domain concurrency: 429/503, timeouts and slow responses halve a host's
+# in-flight window; every AIMD_INCREASE_AFTER clean responses in a row grow it by one.
+AIMD_INITIAL_CONCURRENCY = 2
+AIMD_MIN_CONCURRENCY = 1
+AIMD_MAX_CONCURRENCY = 8
+AIMD_INCREASE_AFTER = 10
+AIMD_DECREASE_FACTOR = 0.5
+AIMD_SLOW_RESPONSE_SECONDS = 10  # a response slower than this counts as congestion
+
+# Headless browser: pages rendered at once from the shared page pool (all sources together)
+HEADLESS_PAGE_POOL_SIZE = 4
+# HTML parser for adapters that don't set PARSER: "lxml", "selectolax" (optional package,
+# soup-like shim) or "html.parser"
+HTML_PARSER_BACKEND = "lxml"
+# Shared HTTP connection pools: hosts kept / connections per host (the AIMD window never
+# puts more than AIMD_MAX_CONCURRENCY requests in flight to one host)
+HTTP_POOL_HOSTS = 32
+HTTP_POOL_MAXSIZE = AIMD_MAX_CONCURRENCY
+# Hosts remembered as needing the browser retry plain HTTP once per this many hours
+TRANSPORT_REPROBE_HOURS = 24
+# Saved logged-in browser sessions (cookies + localStorage, mode 0600), one file per site/account
+HEADLESS_STATE_DIR = os.path.join(os.path.dirname(__file__), ".browser_state")
+HEADLESS_STATE_MAX_AGE_HOURS = 24 * 7
+# Subresources headless pages never load (we only read the HTML). Adapters can re-allow
+# types or hosts with HEADLESS_ALLOW.
+HEADLESS_BLOCKED_RESOURCE_TYPES = {"image", "font", "media", "stylesheet"}
+HEADLESS_BLOCKED_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "facebook.net",
+    "connect.facebook.net",
+    "hotjar.com",
+    "segment.com",
+    "segment.io",
+    "mixpanel.com",
+    "amplitude.com",
+    "intercom.io",
+    "intercomcdn.com",
+    "fullstory.com",
+    "clarity.ms",
+    "adservice.google.com",
+    "ads-twitter.com",
+    "snap.licdn.com",
+    "bat.bing.com",
+    "quantserve.com",
+    "scorecardresearch.com",
+)
+
+# On-disk HTTP response cache (opt-in: main.py --http-cache). Stale entries are revalidated
+# with If-None-Match / If-Modified-Since instead of being downloaded again.
+HTTP_CACHE_DIR = os.path.join(os.path.dirname(__file__), ".http_cache")
+HTTP_CACHE_TTL_SECONDS = 3600
+HTTP_CACHE_MAX_BYTES = 500 * 1024 * 1024
+DETAIL_WORKERS = 4  # concurrent Stage B detail fetches per source (adapters may override)
+PARALLEL_SOURCES = 1  # sources crawled at the same time by run_all (1 = one after another)
+PARSE_PROCESSES = 0  # worker processes parsing + normalizing detail pages (0 = in the detail threads)
+LISTING_PAGE_WORKERS = 4  # listing/API pages fetched at once by paginated sources
+MAX_LISTINGS = 5000  # ceiling on listings one paginated source discovers per run
+# Apply links are followed to their final URL after Stage B (redirect chains resolved
+# concurrently and cached in the DB for APPLY_URL_TTL_HOURS). Links on the source's own site
+# and links already resolved for a stored job are skipped. Default for main.py --resolve-apply-urls.
+RESOLVE_APPLY_URLS = False
+APPLY_RESOLVE_WORKERS = 8
+APPLY_URL_TTL_HOURS = 24 * 7
+# Incremental runs stop paging a feed after this many pages in a row held only known jobs
+EARLY_STOP_PAGES = 1
+# Incremental mode (main.py --incremental): skip detail fetches for jobs whose details were
+# stored less than this many hours ago; they only get last_checked_at bumped.
+DETAIL_REFRESH_TTL_HOURS = 24
 
 # User agents for rotation
 USER_AGENTS = [
@@ -2,13 +2,17 @@
 Database layer — SQLite with the canonical job schema.
 """
 import sqlite3
+import threading
 import uuid
 from contextlib import contextmanager
-from config import DB_PATH
+from config import DB_PATH, DB_BUSY_TIMEOUT
+
+# One writer at a time across all threads in this process (sources may run in parallel)
+_write_lock = threading.RLock()
 
 
 def get_connection():
-    conn = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(DB_PATH, timeout=DB_BUSY_TIMEOUT)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode=WAL")
     conn.execute("PRAGMA foreign_keys=ON")
@@ -28,6 +32,21 @@ def get_db():
         conn.close()
 
 
+@contextmanager
+def write_transaction(conn):
+    """
+    Serialize a unit of writes with every other thread sharing jobs.db and commit it.
+    Keeps transactions short so parallel sources don't hold SQLite's write lock for a whole crawl.
+    """
+    with _write_lock:
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+
 def init_db():
     """Create tables if they don't exist."""
     with get_db() as conn:
@@ -100,6 +119,19 @@ def init_db():
                 status TEXT DEFAULT 'running',
                 error_message TEXT
             );
+
+            CREATE TABLE IF NOT EXISTS apply_url_cache (
+                url TEXT PRIMARY KEY,
+                final_url TEXT NOT NULL,
+                resolved_at TEXT DEFAULT (datetime('now'))
+            );
+
+            CREATE TABLE IF NOT EXISTS host_transport (
+                host TEXT PRIMARY KEY,
+                strategy TEXT NOT NULL,
+                probed_at REAL,
+                updated_at TEXT DEFAULT (datetime('now'))
+            );
         """)
 
 
@@ -161,6 +193,92 @@ def upsert_job(conn, job_data: dict) -> str:
     return job_id
 
 
+# Stay well under SQLite's bound-parameter limit for IN (...) lookups
+_IN_CHUNK = 900
+
+
+def _chunks(values: list, size: int = _IN_CHUNK):
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+def get_recently_refreshed_ids(conn, source: str, source_job_ids, max_age_hours: float) -> set[str]:
+    """
+    Of the given source_job_ids, those whose details were stored within max_age_hours.
+    One query per batch of ids (updated_at is bumped on every detail upsert).
+    """
+    ids = list(dict.fromkeys(str(i) for i in source_job_ids if i))
+    fresh = set()
+    for chunk in _chunks(ids):
+        rows = conn.execute(
+            f"""SELECT source_job_id FROM jobs
+                WHERE source = ? AND source_job_id IN ({', '.join('?' * len(chunk))})
+                  AND updated_at >= datetime('now', ?)""",
+            [source, *chunk, f"-{max_age_hours} hours"],
+        ).fetchall()
+        fresh.update(row["source_job_id"] for row in rows)
+    return fresh
+
+
+def get_known_jobs(conn, source: str, source_job_ids) -> dict[str, sqlite3.Row]:
+    """Of the given source_job_ids, those already stored for source -> their title, company and posted_at."""
+    ids = list(dict.fromkeys(str(i) for i in source_job_ids if i))
+    known = {}
+    for chunk in _chunks(ids):
+        rows = conn.execute(
+            f"""SELECT source_job_id, title, company_name, posted_at FROM jobs
+                WHERE source = ? AND source_job_id IN ({', '.join('?' * len(chunk))})""",
+            [source, *chunk],
+        ).fetchall()
+        known.update((row["source_job_id"], row) for row in rows)
+    return known
+
+
+def touch_jobs(conn, source: str, source_job_ids) -> int:
+    """Mark jobs as still listed without re-fetching them (bumps last_checked_at only)."""
+    ids = list(dict.fromkeys(str(i) for i in source_job_ids if i))
+    touched = 0
+    for chunk in _chunks(ids):
+        cursor = conn.execute(
+            f"""UPDATE jobs SET last_checked_at = datetime('now')
+                WHERE source = ? AND source_job_id IN ({', '.join('?' * len(chunk))})""",
+            [source, *chunk],
+        )
+        touched += cursor.rowcount
+    return touched
+
+
+def get_resolved_urls(conn, urls, max_age_hours: float) -> dict[str, str]:
+    """Cached final URL for each of urls resolved within max_age_hours."""
+    urls = list(dict.fromkeys(urls))
+    resolved = {}
+    for chunk in _chunks(urls):
+        rows = conn.execute(
+            f"""SELECT url, final_url FROM apply_url_cache
+                WHERE url IN ({', '.join('?' * len(chunk))}) AND resolved_at >= datetime('now', ?)""",
+            [*chunk, f"-{max_age_hours} hours"],
+        ).fetchall()
+        resolved.update({row["url"]: row["final_url"] for row in rows})
+    return resolved
+
+
+def save_resolved_urls(conn, resolved: dict[str, str]):
+    """Cache url -> final url pairs (restarting their TTL)."""
+    conn.executemany(
+        """INSERT INTO apply_url_cache (url, final_url, resolved_at) VALUES (?, ?, datetime('now'))
+           ON CONFLICT(url) DO UPDATE SET final_url = excluded.final_url, resolved_at = excluded.resolved_at""",
+        list(resolved.items()),
+    )
+
+
+def set_apply_url_finals(conn, source: str, finals: dict[str, str]):
+    """Store resolved apply URLs (source_job_id -> final url) for jobs of source."""
+    conn.executemany(
+        "UPDATE jobs SET apply_url_final = ? WHERE source = ? AND source_job_id = ?",
+        [(final, source, job_id) for job_id, final in finals.items()],
+    )
+
+
 def check_duplicate_fingerprint(conn, fingerprint: str, exclude_id: str = None) -> dict | None:
     """Check if a job with this fingerprint already exists."""
     if exclude_id:
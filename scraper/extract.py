@@ -0,0 +1,141 @@
+"""
+Declarative field extraction for detail pages.
+
+An adapter describes its detail page as an ExtractionSpec: JobDetail field -> Field(selector,
+read, transform). Specs are class attributes, so every selector is compiled by soupsieve once
+per adapter class instead of being re-parsed on each select_one() call, and all adapters share
+one extractor (ExtractionSpec.extract) that BaseAdapter.detail_from_page turns into a JobDetail.
+"""
+from dataclasses import dataclass
+from typing import Callable
+from urllib.parse import urljoin
+
+import soupsieve
+from bs4.element import Tag
+
+from htmlparse import compile_target_selectors
+
+# Ways to read a matched element (anything else is an attribute name, e.g. "href")
+TEXT = "text"  # stripped text, no separators
+BLOCK_TEXT = "block_text"  # text with one line per text node (descriptions)
+HTML = "html"  # outer HTML
+
+
+@dataclass(frozen=True)
+class Field:
+    """
+    One field. selector: a CSS selector list (first match in document order), or a tuple of
+    them tried in priority order. read: TEXT / BLOCK_TEXT / HTML / an attribute name, or a tuple
+    of those (first non-empty wins). absolute: urljoin the value with the adapter's BASE_URL.
+    transform: str -> value, where a falsy result counts as missing. many: all matches, as a
+    list.
+    """
+    selector: str | tuple[str, ...]
+    read: str | tuple[str, ...] = TEXT
+    absolute: bool = False
+    transform: Callable | None = None
+    many: bool = False
+
+
+class ExtractionSpec:
+    """
+    Field name -> Field, with every selector compiled up front. remove: (within, selector) —
+    before any field is read, the first element matching selector inside the first match of
+    within (a selector, or a tuple tried in priority order) is removed from the page.
+    """
+
+    def __init__(self, fields: dict[str, Field], remove: tuple | None = None):
+        self.fields = fields
+        self.remove = remove
+        self._compiled: dict[str, soupsieve.SoupSieve] = {}
+        selectors = [sel for spec in fields.values() for sel in self._selectors(spec)]
+        if remove:
+            within, selector = remove
+            selectors += list(within if isinstance(within, tuple) else (within,)) + [selector]
+        for selector in selectors:
+            if selector not in self._compiled:
+                self._compiled[selector] = soupsieve.compile(selector)
+
+    @staticmethod
+    def _selectors(spec: Field) -> tuple[str, ...]:
+        return spec.selector if isinstance(spec.selector, tuple) else (spec.selector,)
+
+    def targets(self) -> tuple[str, ...]:
+        """
+        DETAIL_TARGETS that cover every field: a field's selector (its first one, for a
+        priority tuple: the later ones are only read when it never matches, and then the whole
+        page is read anyway). Raises ValueError for many=True fields, which need the whole page.
+        """
+        targets = []
+        for name, spec in self.fields.items():
+            if spec.many:
+                raise ValueError(f"field {name!r} reads every match, so the page can't be cut short")
+            selector = self._selectors(spec)[0]
+            compile_target_selectors(selector)  # unsupported selectors fail at import, not mid-crawl
+            if selector not in targets:
+                targets.append(selector)
+        return tuple(targets)
+
+    def _select_one(self, root, selector: str):
+        if isinstance(root, Tag):
+            return self._compiled[selector].select_one(root)
+        return root.select_one(selector)  # selectolax shim
+
+    def _select(self, root, selector: str) -> list:
+        if isinstance(root, Tag):
+            return self._compiled[selector].select(root)
+        return root.select(selector)
+
+    def extract(self, root, base_url: str = "") -> dict:
+        """Value for every field that was found (missing fields are left out)."""
+        if self.remove:
+            self._remove(root)
+        values = {}
+        found: dict[str, object] = {}  # selector -> first match, shared by fields that repeat it
+        for name, spec in self.fields.items():
+            if spec.many:
+                elements = [el for sel in self._selectors(spec) for el in self._select(root, sel)]
+            else:
+                elements = []
+                for selector in self._selectors(spec):
+                    if selector not in found:
+                        found[selector] = self._select_one(root, selector)
+                    if found[selector] is not None:
+                        elements = [found[selector]]
+                        break
+            results = [v for v in (self._value(el, spec, base_url) for el in elements) if v]
+            if results:
+                values[name] = results if spec.many else results[0]
+        return values
+
+    def _remove(self, root):
+        within, selector = self.remove
+        for scope_selector in within if isinstance(within, tuple) else (within,):
+            scope = self._select_one(root, scope_selector)
+            if scope is not None:
+                unwanted = self._select_one(scope, selector)
+                if unwanted is not None:
+                    unwanted.decompose()
+                return
+
+    @staticmethod
+    def _value(el, spec: Field, base_url: str):
+        value = ""
+        for read in spec.read if isinstance(spec.read, tuple) else (spec.read,):
+            if read == TEXT:
+                value = el.get_text(strip=True)
+            elif read == BLOCK_TEXT:
+                value = el.get_text(separator="\n", strip=True)
+            elif read == HTML:
+                value = str(el)
+            else:
+                value = el.get(read) or ""
+                if isinstance(value, list):
+                    value = " ".join(value)
+            if value:
+                break
+        if value and spec.absolute:
+            value = urljoin(base_url, value)
+        if value and spec.transform:
+            value = spec.transform(value)
+        return value
@@ -1,65 +1,407 @@
 """
 Headless browser fetcher using Playwright.
 Use only for sources that block simple HTTP (403). Lazy-loaded so API-only runs don't need it.
-Runs async Playwright in a fresh event loop per call to avoid conflicts with other async code.
+
+One Chromium is launched per process and kept alive by BrowserService, which drives Playwright
+from a single background event loop thread. Sync callers (any thread) submit coroutines to that
+loop, so there is no per-call browser startup and no conflict with other async code.
+Anonymous fetches share one browser context and render through a bounded PagePool of reusable
+pages (fetch_many renders a whole batch of URLs at once); logged-in sessions get their own context,
+seeded from a saved storage state so the login flow only runs when the session has expired.
+We only ever read page.content(), so every page runs under a ResourcePolicy that aborts images,
+fonts, media, stylesheets and analytics/ad hosts unless the calling adapter allows them.
 """
 import os
 import asyncio
+import atexit
+import concurrent.futures
+import hashlib
+import json
 import logging
+import threading
+import time
+from collections import Counter
 from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from config import (
+    HEADLESS_BLOCKED_HOSTS,
+    HEADLESS_BLOCKED_RESOURCE_TYPES,
+    HEADLESS_PAGE_POOL_SIZE,
+    HEADLESS_STATE_DIR,
+    HEADLESS_STATE_MAX_AGE_HOURS,
+)
+from recorder import get_recorder
 
 logger = logging.getLogger(__name__)
 
+BROWSER_USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+BROWSER_VIEWPORT = {"width": 1280, "height": 720}
 
-async def _fetch_html_async(url: str, timeout_ms: int = 30000) -> Optional[str]:
-    """Fetch a URL with a headless browser. Returns page HTML or None."""
-    try:
-        from playwright.async_api import async_playwright
-    except ImportError:
-        logger.warning(
-            "Playwright not installed. Run: pip install playwright && python -m playwright install chromium"
+
+# Rough transfer sizes of blocked subresources, only used to estimate what blocking saved
+# (an aborted request never tells us its real size).
+_TYPICAL_BYTES = {
+    "image": 40_000,
+    "font": 30_000,
+    "media": 250_000,
+    "stylesheet": 25_000,
+    "script": 60_000,
+}
+
+
+class ResourcePolicy:
+    """
+    Which subresources a headless page may load. `allow` entries are resource types
+    ("stylesheet", "script", ...) or hosts (a suffix match, e.g. "cdn.example.com") that
+    override the global block lists for one adapter.
+    """
+
+    def __init__(self, allow=()):
+        self.allow = tuple(a.lower() for a in allow)
+
+    def allows(self, resource_type: str, url: str) -> bool:
+        host = urlsplit(url).hostname or ""
+        if resource_type in self.allow or any(host == a or host.endswith("." + a) for a in self.allow):
+            return True
+        if resource_type in HEADLESS_BLOCKED_RESOURCE_TYPES:
+            return False
+        return not any(host == b or host.endswith("." + b) for b in HEADLESS_BLOCKED_HOSTS)
+
+
+DEFAULT_POLICY = ResourcePolicy()
+
+
+class BlockStats:
+    """
+    What request interception aborted, across every headless page in the process. Counts are
+    exact; bytes saved is an estimate from _TYPICAL_BYTES, since an aborted request is never
+    answered and so has no size to measure.
+    """
+
+    def __init__(self):
+        self.blocked = Counter()
+        self.estimated_bytes_saved = 0
+
+    def record(self, resource_type: str):
+        self.blocked[resource_type] += 1
+        self.estimated_bytes_saved += _TYPICAL_BYTES.get(resource_type, 10_000)
+
+    def summary(self) -> str:
+        total = sum(self.blocked.values())
+        by_type = ", ".join(f"{t} {n}" for t, n in self.blocked.most_common())
+        return (
+            f"blocked {total} requests ({by_type or 'none'}), "
+            f"~{self.estimated_bytes_saved / 1e6:.1f} MB saved (estimated from typical sizes, not measured)"
         )
-        return None
 
-    try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
+
+async def apply_policy(target, policy_for, stats: BlockStats):
+    """
+    Install request interception on a page or context. policy_for() returns the policy to use
+    for the request being routed, so a pooled page can switch policy between renders.
+    """
+    async def _route(route):
+        request = route.request
+        try:
+            if policy_for().allows(request.resource_type, request.url):
+                await route.continue_()
+            else:
+                stats.record(request.resource_type)
+                await route.abort()
+        except Exception:
+            # Page navigated away or closed mid-route; nothing to do
+            pass
+
+    await target.route("**/*", _route)
+
+
+class BrowserService:
+    """Long-lived Playwright + Chromium on a background event loop."""
+
+    def __init__(self):
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._launch_lock: asyncio.Lock | None = None
+        self._playwright = None
+        self._browser = None
+        self._shared_context = None
+        self._page_pool: PagePool | None = None
+        self._unavailable = False
+        self.block_stats = BlockStats()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name="headless-browser", daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    def run(self, coro, timeout: float | None = None):
+        """Run a coroutine on the browser loop from any other thread and wait for its result."""
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("BrowserService.run() called from the browser loop; await the coroutine instead")
+        future = asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    async def browser(self):
+        """The shared Chromium, launched on first use and relaunched if it crashed. None if unavailable."""
+        if self._launch_lock is None:
+            self._launch_lock = asyncio.Lock()
+        async with self._launch_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return self._browser
+            if self._unavailable:
+                return None
             try:
-                context = await browser.new_context(
-                    user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                    viewport={"width": 1280, "height": 720},
+                from playwright.async_api import async_playwright
+            except ImportError:
+                logger.warning(
+                    "Playwright not installed. Run: pip install playwright && python -m playwright install chromium"
                 )
-                page = await context.new_page()
-                response = await page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
-                if not response or response.status >= 400:
-                    logger.warning("Headless fetch got status %s for %s", getattr(response, "status", None), url)
-                    return None
-                await page.wait_for_timeout(500)
-                html = await page.content()
-                await context.close()
-                return html
-            finally:
-                await browser.close()
+                self._unavailable = True
+                return None
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=True)
+            self._shared_context = None
+            logger.info("Launched headless Chromium")
+            return self._browser
+
+    async def new_context(self, **kwargs):
+        """A fresh browser context (own cookies/storage). Caller closes it."""
+        browser = await self.browser()
+        if browser is None:
+            return None
+        options = {"user_agent": BROWSER_USER_AGENT, "viewport": BROWSER_VIEWPORT}
+        options.update(kwargs)
+        return await browser.new_context(**options)
+
+    async def shared_context(self):
+        """The context reused by every anonymous fetch."""
+        browser = await self.browser()
+        if browser is None:
+            return None
+        if self._shared_context is None:
+            self._shared_context = await self.new_context()
+        return self._shared_context
+
+    def page_pool(self) -> "PagePool":
+        """The pool of reusable pages in the shared context (created on first use)."""
+        if self._page_pool is None:
+            self._page_pool = PagePool(self, HEADLESS_PAGE_POOL_SIZE)
+        return self._page_pool
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._ensure_loop()
+
+    async def _close(self):
+        if self._page_pool is not None:
+            logger.info("Headless page pool: %s; %s", self._page_pool.summary(), self.block_stats.summary())
+            self._page_pool = None
+        for closer in (self._shared_context, self._browser):
+            if closer is not None:
+                try:
+                    await closer.close()
+                except Exception:
+                    pass
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+        self._shared_context = self._browser = self._playwright = None
+
+    def shutdown(self):
+        """Close the browser and stop the loop thread. Safe to call more than once."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close(), loop).result(timeout=30)
+        except Exception as e:
+            logger.debug("Headless shutdown: %s", e)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=10)
+        loop.close()
+        self._launch_lock = None
+
+
+class PagePool:
+    """
+    Up to `size` pages in the shared context, reused across URLs. Lives on the browser loop.
+    Every render has its own timeout; a page that crashes or times out is closed and replaced.
+    """
+
+    def __init__(self, service: BrowserService, size: int):
+        self.service = service
+        self.size = max(1, size)
+        self._idle: list = []
+        self._slots: asyncio.Semaphore | None = None
+        self._policies: dict = {}  # page -> ResourcePolicy for its current render
+        self.rendered = 0
+        self.failed = 0
+        self.recycled = 0
+
+    async def _checkout(self):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.size)
+        await self._slots.acquire()
+        try:
+            while self._idle:
+                page = self._idle.pop()
+                if not page.is_closed():
+                    return page
+            context = await self.service.shared_context()
+            if context is None:
+                return None
+            page = await context.new_page()
+            await apply_policy(page, lambda: self._policies.get(page, DEFAULT_POLICY), self.service.block_stats)
+            return page
+        except Exception:
+            self._slots.release()
+            raise
+
+    async def _checkin(self, page, healthy: bool):
+        if page is not None:
+            self._policies.pop(page, None)
+            if healthy and not page.is_closed() and len(self._idle) < self.size:
+                self._idle.append(page)
+            else:
+                self.recycled += 1
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+        self._slots.release()
+
+    async def render(
+        self, url: str, timeout_ms: int = 30000, settle_ms: int = 500, policy: ResourcePolicy = DEFAULT_POLICY
+    ) -> Optional[str]:
+        """Load url in a pooled page and return its HTML, or None."""
+        page = await self._checkout()
+        healthy = True
+        try:
+            if page is None:
+                return None
+            self._policies[page] = policy
+            response = await asyncio.wait_for(
+                page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms),
+                timeout=timeout_ms / 1000 + 5,
+            )
+            if not response or response.status >= 400:
+                logger.warning("Headless fetch got status %s for %s", getattr(response, "status", None), url)
+                self.failed += 1
+                return None
+            await page.wait_for_timeout(settle_ms)
+            html = await page.content()
+            self.rendered += 1
+            return html
+        except Exception as e:
+            # Crashed, hung or navigated into a broken state: don't hand this page out again
+            healthy = False
+            self.failed += 1
+            logger.warning("Headless fetch failed for %s: %s", url, e)
+            return None
+        finally:
+            await self._checkin(page, healthy)
+
+    def summary(self) -> str:
+        return f"{self.rendered} rendered, {self.failed} failed, {self.recycled} pages recycled"
+
+
+_service = BrowserService()
+atexit.register(_service.shutdown)
+
+
+def get_browser_service() -> BrowserService:
+    return _service
+
+
+def shutdown_browser():
+    """Clean shutdown hook for the shared browser (also registered with atexit)."""
+    _service.shutdown()
+
+
+def _run_sync(coro, timeout: float | None, what: str):
+    try:
+        return _service.run(coro, timeout=timeout)
+    except concurrent.futures.TimeoutError:
+        logger.warning("Headless %s timed out after %ss", what, timeout)
+        return None
+
+
+async def _fetch_html_async(url: str, timeout_ms: int = 30000, allow=()) -> Optional[str]:
+    """Fetch a URL with a headless browser. Returns page HTML or None."""
+    try:
+        return await _service.page_pool().render(url, timeout_ms, policy=ResourcePolicy(allow))
     except Exception as e:
         logger.warning("Headless fetch failed for %s: %s", url, e)
         return None
 
 
-def fetch_html(url: str, timeout_ms: int = 30000) -> Optional[str]:
+def fetch_html(url: str, timeout_ms: int = 30000, allow=()) -> Optional[str]:
     """
     Fetch a URL with a headless browser. Returns page HTML or None.
     Call this only when requests get 403 or when the page is JS-rendered.
+    allow: resource types / hosts this page needs despite the block lists (see ResourcePolicy).
     """
-    try:
-        return asyncio.run(_fetch_html_async(url, timeout_ms))
-    except RuntimeError as e:
-        if "event loop" in str(e).lower() or "asyncio" in str(e).lower():
-            # Already inside an event loop — run in a new thread with its own loop
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
-                future = pool.submit(asyncio.run, _fetch_html_async(url, timeout_ms))
-                return future.result(timeout=(timeout_ms / 1000) + 30)
-        raise
+    recorder = get_recorder()
+    if recorder and recorder.replaying:
+        return recorder.load_text("headless", url)
+    html = _run_sync(_fetch_html_async(url, timeout_ms, allow), (timeout_ms / 1000) + 30, f"fetch of {url}")
+    if recorder:
+        recorder.save("headless", url, html)
+    return html
+
+
+def fetch_many(urls, timeout_ms: int = 30000, throttle=None, allow=()) -> dict[str, Optional[str]]:
+    """
+    Render a batch of URLs concurrently through the shared page pool.
+    Returns {url: html or None}. throttle(url), if given, is called in this thread before each
+    URL is dispatched (e.g. a rate limiter), so pages start as the domain budget allows.
+    """
+    urls = list(dict.fromkeys(u for u in urls if u))
+    recorder = get_recorder()
+    if recorder and recorder.replaying:
+        return {url: recorder.load_text("headless", url) for url in urls}
+
+    pool = _service.page_pool()
+    futures = {}
+    for url in urls:
+        if throttle:
+            throttle(url)
+        futures[url] = asyncio.run_coroutine_threadsafe(_fetch_html_async(url, timeout_ms, allow), _service.loop)
+
+    results: dict[str, Optional[str]] = {}
+    for url, future in futures.items():
+        try:
+            # Generous: this URL may have queued behind the rest of the batch for a free page
+            results[url] = future.result(timeout=(timeout_ms / 1000 + 30) * (1 + len(urls) / pool.size))
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            logger.warning("Headless batch fetch timed out for %s", url)
+            results[url] = None
+        if recorder:
+            recorder.save("headless", url, results[url])
+    return results
 
 
 async def _fetch_html_with_scroll_async(
@@ -67,67 +409,63 @@ async def _fetch_html_with_scroll_async(
     scroll_cycles: int = 15,
     scroll_pause_ms: int = 800,
     timeout_ms: int = 60000,
+    allow=(),
 ) -> Optional[str]:
     """
     Load URL in headless browser, scroll to bottom and optionally click "Load more"
     to trigger lazy-loaded content, then return final page HTML.
     """
+    page = None
     try:
-        from playwright.async_api import async_playwright
-    except ImportError:
-        logger.warning("Playwright not installed.")
-        return None
+        context = await _service.shared_context()
+        if context is None:
+            return None
+        page = await context.new_page()
+        policy = ResourcePolicy(allow)
+        await apply_policy(page, lambda: policy, _service.block_stats)
+        response = await page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
+        if not response or response.status >= 400:
+            logger.warning("Headless scroll fetch got status %s for %s", getattr(response, "status", None), url)
+            return None
+        await page.wait_for_timeout(1500)
 
-    try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            try:
-                context = await browser.new_context(
-                    user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                    viewport={"width": 1280, "height": 720},
-                )
-                page = await context.new_page()
-                response = await page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
-                if not response or response.status >= 400:
-                    logger.warning("Headless scroll fetch got status %s for %s", getattr(response, "status", None), url)
-                    return None
-                await page.wait_for_timeout(1500)
-
-                load_more_texts = ["Load more", "Load more jobs", "Show more", "See more jobs", "More jobs"]
-                for _ in range(scroll_cycles):
-                    # Try to click a "Load more" style button if present
-                    clicked = False
-                    for text in load_more_texts:
-                        try:
-                            for loc in [
-                                page.get_by_role("button", name=text),
-                                page.locator(f'button:has-text("{text}")'),
-                                page.locator(f'a:has-text("{text}")'),
-                            ]:
-                                if await loc.count() > 0:
-                                    first = loc.first
-                                    if await first.is_visible():
-                                        await first.click()
-                                        await page.wait_for_timeout(scroll_pause_ms)
-                                        clicked = True
-                                        break
-                            if clicked:
+        load_more_texts = ["Load more", "Load more jobs", "Show more", "See more jobs", "More jobs"]
+        for _ in range(scroll_cycles):
+            # Try to click a "Load more" style button if present
+            clicked = False
+            for text in load_more_texts:
+                try:
+                    for loc in [
+                        page.get_by_role("button", name=text),
+                        page.locator(f'button:has-text("{text}")'),
+                        page.locator(f'a:has-text("{text}")'),
+                    ]:
+                        if await loc.count() > 0:
+                            first = loc.first
+                            if await first.is_visible():
+                                await first.click()
+                                await page.wait_for_timeout(scroll_pause_ms)
+                                clicked = True
                                 break
-                        except Exception:
-                            pass
-
-                    # Scroll to bottom to trigger infinite scroll
-                    await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                    await page.wait_for_timeout(scroll_pause_ms)
-
-                html = await page.content()
-                await context.close()
-                return html
-            finally:
-                await browser.close()
+                    if clicked:
+                        break
+                except Exception:
+                    pass
+
+            # Scroll to bottom to trigger infinite scroll
+            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+            await page.wait_for_timeout(scroll_pause_ms)
+
+        return await page.content()
     except Exception as e:
         logger.warning("Headless scroll fetch failed for %s: %s", url, e)
         return None
+    finally:
+        if page is not None:
+            try:
+                await page.close()
+            except Exception:
+                pass
 
 
 def fetch_html_with_scroll(
@@ -135,23 +473,181 @@ def fetch_html_with_scroll(
     scroll_cycles: int = 15,
     scroll_pause_ms: int = 800,
     timeout_ms: int = 60000,
+    allow=(),
 ) -> Optional[str]:
     """
     Load URL, scroll and click "Load more" as needed, return final HTML.
     Use for pages that lazy-load or paginate with a button.
     """
+    recorder = get_recorder()
+    if recorder and recorder.replaying:
+        return recorder.load_text("headless-scroll", url)
+    html = _run_sync(
+        _fetch_html_with_scroll_async(url, scroll_cycles, scroll_pause_ms, timeout_ms, allow),
+        (timeout_ms / 1000) + 60,
+        f"scroll fetch of {url}",
+    )
+    if recorder:
+        recorder.save("headless-scroll", url, html)
+    return html
+
+
+def _state_path(login_url: str, email: str) -> str:
+    """Where the storage state for one (site, account) pair is kept."""
+    host = urlsplit(login_url).hostname or "site"
+    account = hashlib.sha256(email.lower().encode()).hexdigest()[:12]
+    return os.path.join(HEADLESS_STATE_DIR, f"{host}-{account}.json")
+
+
+def _load_state(path: str) -> Optional[dict]:
+    """
+    Saved storage state, or None if there is none or it is obviously dead: older than
+    HEADLESS_STATE_MAX_AGE_HOURS or every cookie with an expiry has expired.
+    """
     try:
-        return asyncio.run(_fetch_html_with_scroll_async(url, scroll_cycles, scroll_pause_ms, timeout_ms))
-    except RuntimeError as e:
-        if "event loop" in str(e).lower() or "asyncio" in str(e).lower():
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
-                future = pool.submit(
-                    asyncio.run,
-                    _fetch_html_with_scroll_async(url, scroll_cycles, scroll_pause_ms, timeout_ms),
-                )
-                return future.result(timeout=(timeout_ms / 1000) + 60)
-        raise
+        if time.time() - os.path.getmtime(path) > HEADLESS_STATE_MAX_AGE_HOURS * 3600:
+            return None
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    expiries = [c.get("expires", -1) for c in state.get("cookies", [])]
+    dated = [e for e in expiries if e and e > 0]
+    if dated and max(dated) < time.time():
+        return None
+    return state
+
+
+async def _save_state(context, path: str):
+    """Write the context's cookies/localStorage to path, readable by the owner only."""
+    try:
+        state = await context.storage_state()
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        tmp = f"{path}.tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, path)
+    except Exception as e:
+        logger.warning("Could not save browser session to %s: %s", path, e)
+
+
+async def _is_logged_out(page) -> bool:
+    """Cheap session check: a visible "Log in" / "Sign in" control means the session is gone."""
+    for role, name in [("button", "Log in"), ("button", "Log In"), ("link", "Log in"), ("button", "Sign in")]:
+        try:
+            loc = page.get_by_role(role, name=name, exact=True).first
+            if await loc.count() > 0 and await loc.is_visible():
+                return True
+        except Exception:
+            continue
+    return False
+
+
+async def _log_in(page, login_url: str, email: str, password: str, timeout_ms: int) -> bool:
+    """Run the site's login flow in page. Returns whether the form was submitted."""
+    await page.goto(login_url, wait_until="networkidle", timeout=timeout_ms)
+    await page.wait_for_timeout(3000)
+    # If no email field yet, try clicking "Log in" / "Sign in" (for SPAs with modal or lazy form)
+    email_selectors = [
+        'input[type="email"]',
+        'input[name="email"]',
+        'input[id="email"]',
+        'input[placeholder*="mail" i]',
+        'input[placeholder*="email" i]',
+        'input[name="username"]',
+        'input[autocomplete="email"]',
+    ]
+    email_loc = None
+    for sel in email_selectors:
+        try:
+            loc = page.locator(sel)
+            if await loc.count() > 0:
+                await loc.first.wait_for(state="visible", timeout=5000)
+                email_loc = loc.first
+                break
+        except Exception:
+            continue
+    if not email_loc:
+        # Open login popup: header has "Log in" button (or link) that opens a modal
+        for role, name in [("button", "Log in"), ("button", "Log In"), ("link", "Log in")]:
+            try:
+                loc = page.get_by_role(role, name=name).first
+                if await loc.count() > 0:
+                    await loc.click()
+                    await page.wait_for_timeout(2000)
+                    break
+            except Exception:
+                continue
+        # In popup: choose "Sign in" to show email/password form (tab or link)
+        for role in ["link", "button"]:
+            try:
+                sign_in = page.get_by_role(role, name="Sign in").first
+                if await sign_in.count() > 0:
+                    await sign_in.click()
+                    await page.wait_for_timeout(2000)
+                    break
+            except Exception:
+                continue
+        for sel in email_selectors:
+            try:
+                loc = page.locator(sel)
+                if await loc.count() > 0:
+                    await loc.first.wait_for(state="visible", timeout=10000)
+                    email_loc = loc.first
+                    break
+            except Exception:
+                continue
+    if not email_loc:
+        logger.warning("Login form fill/click failed: no email/username input found")
+        # Save page HTML for debugging (find correct selectors from this file)
+        try:
+            _debug_path = os.path.join(os.path.dirname(__file__), "remotesource_debug.html")
+            with open(_debug_path, "w", encoding="utf-8") as f:
+                f.write(await page.content())
+            logger.info("Saved page HTML to %s — open it to find the correct input selectors", _debug_path)
+        except Exception as e:
+            logger.debug("Could not save debug HTML: %s", e)
+        return False
+    await email_loc.fill(email)
+    pass_selectors = [
+        'input[type="password"]',
+        'input[name="password"]',
+        'input[id="password"]',
+        'input[autocomplete="current-password"]',
+    ]
+    pass_loc = None
+    for sel in pass_selectors:
+        try:
+            loc = page.locator(sel)
+            if await loc.count() > 0:
+                pass_loc = loc.first
+                break
+        except Exception:
+            continue
+    if not pass_loc:
+        logger.warning("Login form fill/click failed: no password input found")
+        return False
+    await pass_loc.fill(password)
+    submit_selectors = [
+        'button[type="submit"]',
+        'input[type="submit"]',
+        'button:has-text("Log in")',
+        'button:has-text("Sign in")',
+        'button:has-text("Log In")',
+        '[type="submit"]',
+    ]
+    for sel in submit_selectors:
+        try:
+            btn = page.locator(sel)
+            if await btn.count() > 0:
+                await btn.first.click()
+                break
+        except Exception:
+            continue
+    await page.wait_for_load_state("networkidle", timeout=15000)
+    await page.wait_for_timeout(2000)
+    return True
 
 
 async def _with_logged_in_session_async(
@@ -160,151 +656,62 @@ async def _with_logged_in_session_async(
     password: str,
     async_callback,
     timeout_ms: int = 30000,
+    allow=(),
 ):
     """
-    Start browser, log in at login_url with email/password, then call async_callback(page).
+    Open a fresh context on the shared browser, log in at login_url with email/password,
+    then call async_callback(page).
+    A previously saved session for this account is tried first and the login flow only runs
+    when that session turns out to be missing or expired.
     async_callback must be async and accept one argument (page). Return value is passed through.
     """
+    state_path = _state_path(login_url, email)
+    state = _load_state(state_path)
     try:
-        from playwright.async_api import async_playwright
-    except ImportError:
-        logger.warning("Playwright not installed.")
+        context = await _service.new_context(storage_state=state) if state else await _service.new_context()
+    except Exception as e:
+        logger.warning("Could not start headless browser for login: %s", e)
         return None
-
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(
-            user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            viewport={"width": 1280, "height": 720},
-        )
-        page = await context.new_page()
-        try:
-            await page.goto(login_url, wait_until="networkidle", timeout=timeout_ms)
-            await page.wait_for_timeout(3000)
-            # If no email field yet, try clicking "Log in" / "Sign in" (for SPAs with modal or lazy form)
-            email_selectors = [
-                'input[type="email"]',
-                'input[name="email"]',
-                'input[id="email"]',
-                'input[placeholder*="mail" i]',
-                'input[placeholder*="email" i]',
-                'input[name="username"]',
-                'input[autocomplete="email"]',
-            ]
-            email_loc = None
-            for sel in email_selectors:
-                try:
-                    loc = page.locator(sel)
-                    if await loc.count() > 0:
-                        await loc.first.wait_for(state="visible", timeout=5000)
-                        email_loc = loc.first
-                        break
-                except Exception:
-                    continue
-            if not email_loc:
-                # Open login popup: header has "Log in" button (or link) that opens a modal
-                for role, name in [("button", "Log in"), ("button", "Log In"), ("link", "Log in")]:
-                    try:
-                        loc = page.get_by_role(role, name=name).first
-                        if await loc.count() > 0:
-                            await loc.click()
-                            await page.wait_for_timeout(2000)
-                            break
-                    except Exception:
-                        continue
-                # In popup: choose "Sign in" to show email/password form (tab or link)
-                for role in ["link", "button"]:
-                    try:
-                        sign_in = page.get_by_role(role, name="Sign in").first
-                        if await sign_in.count() > 0:
-                            await sign_in.click()
-                            await page.wait_for_timeout(2000)
-                            break
-                    except Exception:
-                        continue
-                for sel in email_selectors:
-                    try:
-                        loc = page.locator(sel)
-                        if await loc.count() > 0:
-                            await loc.first.wait_for(state="visible", timeout=10000)
-                            email_loc = loc.first
-                            break
-                    except Exception:
-                        continue
-            if not email_loc:
-                logger.warning("Login form fill/click failed: no email/username input found")
-                # Save page HTML for debugging (find correct selectors from this file)
-                try:
-                    _debug_path = os.path.join(os.path.dirname(__file__), "remotesource_debug.html")
-                    with open(_debug_path, "w", encoding="utf-8") as f:
-                        f.write(await page.content())
-                    logger.info("Saved page HTML to %s — open it to find the correct input selectors", _debug_path)
-                except Exception as e:
-                    logger.debug("Could not save debug HTML: %s", e)
-                await context.close()
-                await browser.close()
-                return None
-            await email_loc.fill(email)
-            pass_selectors = [
-                'input[type="password"]',
-                'input[name="password"]',
-                'input[id="password"]',
-                'input[autocomplete="current-password"]',
-            ]
-            pass_loc = None
-            for sel in pass_selectors:
-                try:
-                    loc = page.locator(sel)
-                    if await loc.count() > 0:
-                        pass_loc = loc.first
-                        break
-                except Exception:
-                    continue
-            if not pass_loc:
-                logger.warning("Login form fill/click failed: no password input found")
-                await context.close()
-                await browser.close()
+    if context is None:
+        return None
+    policy = ResourcePolicy(allow)
+    await apply_policy(context, lambda: policy, _service.block_stats)
+    page = await context.new_page()
+    try:
+        logged_in = False
+        if state:
+            await page.goto(login_url, wait_until="load", timeout=timeout_ms)
+            logged_in = not await _is_logged_out(page)
+            logger.info("Saved browser session %s", "reused" if logged_in else "expired, logging in again")
+        if not logged_in:
+            if not await _log_in(page, login_url, email, password, timeout_ms):
                 return None
-            await pass_loc.fill(password)
-            submit_selectors = [
-                'button[type="submit"]',
-                'input[type="submit"]',
-                'button:has-text("Log in")',
-                'button:has-text("Sign in")',
-                'button:has-text("Log In")',
-                '[type="submit"]',
-            ]
-            for sel in submit_selectors:
-                try:
-                    btn = page.locator(sel)
-                    if await btn.count() > 0:
-                        await btn.first.click()
-                        break
-                except Exception:
-                    continue
-            await page.wait_for_load_state("networkidle", timeout=15000)
-            await page.wait_for_timeout(2000)
-            result = await async_callback(page)
-            return result
-        finally:
-            await context.close()
-            await browser.close()
+            await _save_state(context, state_path)
+        result = await async_callback(page)
+        # Sites rotate tokens as you browse; keep the freshest copy for next run
+        await _save_state(context, state_path)
+        return result
+    finally:
+        await context.close()
 
 
-def with_logged_in_session(login_url: str, email: str, password: str, async_callback, timeout_ms: int = 30000):
-    """Sync wrapper: log in at login_url, then run async_callback(page). Returns callback result."""
-    try:
-        return asyncio.run(_with_logged_in_session_async(login_url, email, password, async_callback, timeout_ms))
-    except RuntimeError as e:
-        if "event loop" in str(e).lower() or "asyncio" in str(e).lower():
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
-                future = pool.submit(
-                    asyncio.run,
-                    _with_logged_in_session_async(login_url, email, password, async_callback, timeout_ms),
-                )
-                return future.result(timeout=120)
-        raise
+def with_logged_in_session(
+    login_url: str, email: str, password: str, async_callback, timeout_ms: int = 30000, allow=()
+):
+    """
+    Sync wrapper: log in at login_url, then run async_callback(page). Returns callback result.
+    Under --record/--replay, string results (page HTML) are saved/served keyed by login_url.
+    """
+    recorder = get_recorder()
+    if recorder and recorder.replaying:
+        return recorder.load_text("headless-login", login_url)
+    # No overall timeout: the callback may click "See more" for minutes; each step has its own
+    result = _service.run(
+        _with_logged_in_session_async(login_url, email, password, async_callback, timeout_ms, allow)
+    )
+    if recorder and isinstance(result, str):
+        recorder.save("headless-login", login_url, result)
+    return result
 
 
 class HeadlessResponse:
@@ -314,10 +721,11 @@ class HeadlessResponse:
         self.text = text
         self.status_code = status_code
         self.url = url
+        self.headers = {}
 
     def raise_for_status(self):
         if self.status_code >= 400:
-            raise OSError(f"HTTP {self.status_code}")
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
 
     def json(self):
         import json
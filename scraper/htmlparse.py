@@ -0,0 +1,348 @@
+"""
+HTML parser backends for BaseAdapter.parse_html.
+
+LXML (the default) builds BeautifulSoup trees with lxml's C parser instead of the pure-Python
+html.parser. SELECTOLAX parses with selectolax's Lexbor engine and wraps nodes in a thin shim
+exposing the subset of the soup API adapters use (select, select_one, get_text, get, [attr],
+name, decompose, str()), which is several times faster again. A backend whose package is not
+installed falls back to the next one (selectolax -> lxml -> html.parser).
+
+Region parsing: with regions (simple selectors such as "section.jobs, div#main") the soup
+backends build nodes only for the matching subtrees (and everything inside them), skipping the
+rest of the document. Page chrome, scripts and sidebars are then never turned into Python
+objects. selectolax ignores regions; its whole-document parse is already cheaper.
+
+Early termination: TargetScanner is fed the body of a page as it downloads and reports when
+an element matching each target (simple selectors, optionally with descendant combinators) has
+been closed, so the caller can stop reading and parse just the prefix it has (see
+BaseAdapter.fetch_detail_page).
+"""
+import logging
+import re
+from functools import lru_cache
+from html.parser import HTMLParser
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+logger = logging.getLogger(__name__)
+
+SELECTOLAX = "selectolax"
+LXML = "lxml"
+HTML_PARSER = "html.parser"
+
+_missing: set[str] = set()
+
+
+def _has_lxml() -> bool:
+    if LXML in _missing:
+        return False
+    try:
+        import lxml  # noqa: F401
+        return True
+    except ImportError:
+        logger.warning("lxml not installed, parsing HTML with html.parser (pip install lxml)")
+        _missing.add(LXML)
+        return False
+
+
+def _selectolax_parser():
+    if SELECTOLAX in _missing:
+        return None
+    try:
+        from selectolax.lexbor import LexborHTMLParser
+        return LexborHTMLParser
+    except ImportError:
+        logger.warning("selectolax not installed, parsing HTML with lxml instead (pip install selectolax)")
+        _missing.add(SELECTOLAX)
+        return None
+
+
+class SelectolaxNode:
+    """A selectolax node behind the part of bs4's Tag interface the adapters rely on."""
+
+    __slots__ = ("_node",)
+
+    def __init__(self, node):
+        self._node = node
+
+    @property
+    def name(self) -> str:
+        return self._node.tag
+
+    @property
+    def attrs(self) -> dict:
+        return self._node.attributes
+
+    def select(self, selector: str) -> list["SelectolaxNode"]:
+        return [SelectolaxNode(n) for n in self._node.css(selector)]
+
+    def select_one(self, selector: str) -> "SelectolaxNode | None":
+        node = self._node.css_first(selector)
+        return SelectolaxNode(node) if node is not None else None
+
+    def get_text(self, separator: str = "", strip: bool = False) -> str:
+        if not strip:
+            return self._node.text(deep=True, separator=separator)
+        # Same as bs4: strip every text node, drop the empty ones, join the rest
+        parts = self._node.text(deep=True, separator="\x00").split("\x00")
+        return separator.join(p.strip() for p in parts if p.strip())
+
+    def get(self, key: str, default=None):
+        value = self._node.attributes.get(key)
+        return default if value is None else value
+
+    def __getitem__(self, key: str):
+        value = self._node.attributes[key]
+        return "" if value is None else value
+
+    def decompose(self):
+        self._node.decompose()
+
+    def __str__(self) -> str:
+        return self._node.html or ""
+
+
+_TAG = re.compile(r"[a-zA-Z][a-zA-Z0-9-]*")
+_QUALIFIER = re.compile(
+    r"""\.([\w-]+)|#([\w-]+)|\[\s*([\w:-]+)\s*(?:([*^$~]?=)\s*(?:"([^"]*)"|'([^']*)'|([^\]\s]*))\s*)?\]"""
+)
+_ATTR_TESTS = {
+    None: lambda value, wanted: True,
+    "=": lambda value, wanted: value == wanted,
+    "*=": lambda value, wanted: wanted in value,
+    "^=": lambda value, wanted: value.startswith(wanted),
+    "$=": lambda value, wanted: value.endswith(wanted),
+    "~=": lambda value, wanted: wanted in value.split(),
+}
+
+
+class SimpleSelectors:
+    """
+    A comma-separated list of compound selectors without combinators: tag, .class, #id and
+    [attr], [attr=v], [attr*=v], [attr^=v], [attr$=v], [attr~=v] in any combination (e.g.
+    div.job_listing, a[href*='apply']). Matches a tag from its name and attributes alone.
+    """
+
+    def __init__(self, selectors: str):
+        self.selectors = selectors
+        self.rules = [self._compile(selector.strip()) for selector in selectors.split(",")]
+
+    @staticmethod
+    def _compile(selector: str):
+        tag_match = _TAG.match(selector)
+        tag = tag_match.group().lower() if tag_match else None
+        pos = tag_match.end() if tag_match else 0
+        classes, attrs = set(), []
+        while pos < len(selector):
+            match = _QUALIFIER.match(selector, pos)
+            if not match:
+                break
+            cls, id_, attr, op, *values = match.groups()
+            if cls:
+                classes.add(cls)
+            elif id_:
+                attrs.append(("id", "=", id_))
+            else:
+                attrs.append((attr.lower(), op, next((v for v in values if v is not None), "")))
+            pos = match.end()
+        if not selector or pos < len(selector):
+            raise ValueError(f"unsupported selector {selector!r} (use tag, .class, #id, [attr op value])")
+        return tag, frozenset(classes), attrs
+
+    def matches(self, name: str, attrs) -> bool:
+        """attrs: a dict (bs4) or a list of pairs (html.parser); values may be None or lists."""
+        attrs = dict(attrs or ())
+        classes = attrs.get("class") or ()
+        if isinstance(classes, str):
+            classes = classes.split()
+        for tag, wanted_classes, wanted_attrs in self.rules:
+            if tag and tag != name:
+                continue
+            if wanted_classes and not wanted_classes.issubset(classes):
+                continue
+            if all(self._attr_matches(attrs, *test) for test in wanted_attrs):
+                return True
+        return False
+
+    @staticmethod
+    def _attr_matches(attrs: dict, attr: str, op, wanted: str) -> bool:
+        if attr not in attrs:
+            return False
+        value = attrs[attr]
+        if isinstance(value, list):
+            value = " ".join(value)
+        return _ATTR_TESTS[op](value or "", wanted)
+
+
+@lru_cache(maxsize=None)
+def compile_selectors(selectors: str) -> SimpleSelectors:
+    """Compiled selectors, built once per distinct declaration."""
+    return SimpleSelectors(selectors)
+
+
+class RegionStrainer(SoupStrainer):
+    """
+    Keeps the elements matching any of a list of simple selectors (see SimpleSelectors),
+    together with all their descendants.
+    """
+
+    # Never let bs4 treat this as "parse everything" (it has no SoupStrainer rules of its own)
+    includes_everything = False
+
+    def __init__(self, selectors: str):
+        super().__init__()
+        self.selectors = compile_selectors(selectors)
+
+    def matches(self, name: str, attrs) -> bool:
+        return self.selectors.matches(name, attrs)
+
+    # bs4 >= 4.13 asks allow_tag_creation, older versions search_tag; both only for top-level
+    # tags, so a matched region's descendants are always kept.
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        return self.matches(name, attrs)
+
+    def search_tag(self, name, attrs=None):
+        return self.matches(name, attrs)
+
+    def allow_string_creation(self, string) -> bool:
+        return False
+
+
+@lru_cache(maxsize=None)
+def region_strainer(selectors: str) -> RegionStrainer:
+    """The strainer for a selector list, built once per distinct declaration."""
+    return RegionStrainer(selectors)
+
+
+class TargetSelectors:
+    """
+    SimpleSelectors plus the descendant combinator ("h2 a", "[class*='company'] a"), for
+    TargetScanner: an element matches given its ancestors, innermost last.
+    """
+
+    def __init__(self, selectors: str):
+        self.selectors = selectors
+        self.chains = [
+            [compile_selectors(compound) for compound in _split_outside_brackets(selector, " ")]
+            for selector in _split_outside_brackets(selectors, ",")
+        ]
+
+    def matches(self, name: str, attrs, ancestors) -> bool:
+        """ancestors: (name, attrs) of each enclosing element, outermost first."""
+        return any(self._chain_matches(chain, name, attrs, ancestors) for chain in self.chains)
+
+    @staticmethod
+    def _chain_matches(chain, name: str, attrs, ancestors) -> bool:
+        *outer, last = chain
+        if not last.matches(name, attrs):
+            return False
+        pos = len(ancestors)
+        for compound in reversed(outer):
+            pos -= 1
+            while pos >= 0 and not compound.matches(*ancestors[pos]):
+                pos -= 1
+            if pos < 0:
+                return False
+        return True
+
+
+def _split_outside_brackets(text: str, separator: str) -> list[str]:
+    """text split on separator, except inside [...] (attribute values may contain either)."""
+    parts, current, depth = [], "", 0
+    for char in text:
+        depth += {"[": 1, "]": -1}.get(char, 0)
+        if char == separator and not depth:
+            parts.append(current)
+            current = ""
+        else:
+            current += char
+    parts.append(current)
+    return [part.strip() for part in parts if part.strip()]
+
+
+@lru_cache(maxsize=None)
+def compile_target_selectors(selectors: str) -> TargetSelectors:
+    """Compiled target selectors, built once per distinct declaration."""
+    return TargetSelectors(selectors)
+
+
+_VOID_ELEMENTS = frozenset(
+    "area base br col embed hr img input link meta param source track wbr".split()
+)
+
+
+class TargetScanner(HTMLParser):
+    """
+    Incremental scan for target groups (each a TargetSelectors string). feed() returns True once
+    every group has had a matching element opened and closed, i.e. the text fed so far already
+    contains the complete first match of each group.
+    """
+
+    def __init__(self, targets):
+        super().__init__()
+        self.pending = {target: compile_target_selectors(target) for target in targets}
+        # (name, attrs) of the open elements, outermost first
+        self._stack: list[tuple[str, list]] = []
+        # (target, stack depth of its element) for matches still open
+        self._open: list[tuple[str, int]] = []
+
+    @property
+    def done(self) -> bool:
+        return not self.pending
+
+    def feed(self, data: str) -> bool:
+        if self.pending:
+            super().feed(data)
+        return self.done
+
+    def _matching(self, tag: str, attrs) -> list[str]:
+        opened = {target for target, _ in self._open}
+        return [
+            t for t, sel in self.pending.items() if t not in opened and sel.matches(tag, attrs, self._stack)
+        ]
+
+    def handle_starttag(self, tag, attrs):
+        matched = self._matching(tag, attrs)
+        if tag in _VOID_ELEMENTS:
+            for target in matched:
+                self.pending.pop(target, None)
+            return
+        self._stack.append((tag, attrs))
+        self._open.extend((target, len(self._stack)) for target in matched)
+
+    def handle_startendtag(self, tag, attrs):
+        for target in self._matching(tag, attrs):
+            self.pending.pop(target, None)
+
+    def handle_endtag(self, tag):
+        if not any(name == tag for name, _ in self._stack):
+            return
+        # Pop implicitly closed elements (unclosed <p>, <li>...) along with this one
+        while self._stack.pop()[0] != tag:
+            pass
+        depth = len(self._stack)
+        for target, opened_at in [entry for entry in self._open if entry[1] > depth]:
+            self.pending.pop(target, None)
+        self._open = [entry for entry in self._open if entry[1] <= depth]
+
+
+def parse(html: str, backend: str = LXML, regions: str | None = None):
+    """
+    Parse html with backend; returns a BeautifulSoup tree, or a SelectolaxNode for SELECTOLAX.
+    With regions, soup backends keep only the matching subtrees, and fall back to the whole
+    document when no region matched (so a layout change degrades to a full parse).
+    """
+    if backend == SELECTOLAX:
+        parser = _selectolax_parser()
+        root = parser(html).root if parser is not None else None
+        if root is not None:
+            return SelectolaxNode(root)
+        backend = LXML
+    if backend == LXML and not _has_lxml():
+        backend = HTML_PARSER
+    if regions:
+        soup = BeautifulSoup(html, backend, parse_only=region_strainer(regions))
+        if soup.find() is not None:
+            return soup
+        logger.debug("No %r region in page, parsing the whole document", regions)
+    return BeautifulSoup(html, backend)
@@ -0,0 +1,221 @@
+"""
+Opt-in on-disk HTTP response cache.
+Entries are keyed by the full request URL and stored gzip-compressed. Fresh entries (younger
+than the TTL) are served without touching the network; stale ones are revalidated with
+If-None-Match / If-Modified-Since, and a 304 reuses the stored body. Total size on disk is
+bounded with least-recently-used eviction (file mtime = last use).
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(url: str, params=None) -> str:
+    """The URL requests would actually send, so ?page=2 and params={"page": 2} share an entry."""
+    if not params:
+        return url
+    return requests.Request("GET", url, params=params).prepare().url
+
+
+class CachedResponse:
+    """
+    A response replayed from a stored body and headers: served as-is while the entry is fresh,
+    or after the server answered 304 to a revalidation with the stored ETag/Last-Modified.
+    fetch_detail_page also wraps a streamed page prefix in one (with from_cache False).
+    """
+
+    from_cache = True
+
+    def __init__(self, text: str, status_code: int = 200, url: str = "", headers: dict | None = None):
+        self.text = text
+        self.status_code = status_code
+        self.url = url
+        self.headers = headers or {}
+
+    @property
+    def content(self) -> bytes:
+        return self.text.encode("utf-8")
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class CacheEntry:
+    def __init__(self, path: str, data: dict):
+        self.path = path
+        self.url = data.get("url", "")
+        self.status_code = data.get("status_code", 200)
+        self.headers = data.get("headers", {})
+        self.body = data.get("body", "")
+        self.stored_at = data.get("stored_at", 0)
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.time() - self.stored_at < ttl
+
+    def validators(self) -> dict:
+        """Conditional request headers for revalidating this entry."""
+        headers = {}
+        if self.headers.get("etag"):
+            headers["If-None-Match"] = self.headers["etag"]
+        if self.headers.get("last-modified"):
+            headers["If-Modified-Since"] = self.headers["last-modified"]
+        return headers
+
+    def to_response(self) -> CachedResponse:
+        return CachedResponse(self.body, self.status_code, self.url, dict(self.headers))
+
+
+class ResponseCache:
+    """Compressed response bodies on disk with a TTL and a size-bounded LRU."""
+
+    # Only these headers are kept; they are all revalidation or decoding needs
+    KEPT_HEADERS = ("etag", "last-modified", "content-type")
+
+    def __init__(self, directory: str, ttl_seconds: float, max_bytes: int):
+        self.directory = directory
+        self.ttl = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._sizes: dict[str, int] = {}
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):
+            if name.endswith(".json.gz"):
+                path = os.path.join(directory, name)
+                self._sizes[path] = os.path.getsize(path)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest() + ".json.gz")
+
+    def get(self, key: str) -> CacheEntry | None:
+        """Stored entry for key (fresh or stale), or None. Marks the entry as recently used."""
+        path = self._path(key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.debug("Dropping unreadable cache entry %s: %s", path, e)
+            self._remove(path)
+            return None
+        return CacheEntry(path, data)
+
+    def lookup(self, key: str) -> tuple[CachedResponse | None, CacheEntry | None]:
+        """
+        (response, None) when a fresh entry can be served as-is; (None, entry) when a stale entry
+        should be revalidated; (None, None) on a miss.
+        """
+        entry = self.get(key)
+        if entry and entry.is_fresh(self.ttl):
+            self.hits += 1
+            return entry.to_response(), None
+        if not entry:
+            self.misses += 1
+        return None, entry
+
+    def revalidated_response(self, entry: CacheEntry) -> CachedResponse:
+        """The server answered 304: restart the entry's TTL and serve the stored body."""
+        self.revalidated += 1
+        self._write(entry.path, {
+            "url": entry.url,
+            "status_code": entry.status_code,
+            "headers": entry.headers,
+            "body": entry.body,
+            "stored_at": time.time(),
+        })
+        return entry.to_response()
+
+    def store(self, key: str, text: str, url: str = "", headers=None, status_code: int = 200):
+        """Save a successful response body."""
+        headers = headers or {}
+        kept = {h: headers[h] for h in self.KEPT_HEADERS if headers.get(h)}
+        self._write(self._path(key), {
+            "url": url or key,
+            "status_code": status_code,
+            "headers": kept,
+            "body": text,
+            "stored_at": time.time(),
+        })
+
+    def _write(self, path: str, data: dict):
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with gzip.open(tmp, "wt", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, path)
+            size = os.path.getsize(path)
+        except OSError as e:
+            logger.warning("Could not write cache entry %s: %s", path, e)
+            return
+        with self._lock:
+            self._sizes[path] = size
+            over = sum(self._sizes.values()) > self.max_bytes
+        if over:
+            self._evict()
+
+    def _evict(self):
+        """Delete least-recently-used entries until the cache fits in max_bytes."""
+        with self._lock:
+            by_age = []
+            for path in self._sizes:
+                try:
+                    by_age.append((os.path.getmtime(path), path))
+                except OSError:
+                    by_age.append((0, path))
+            by_age.sort()
+            total = sum(self._sizes.values())
+            evicted = 0
+            for _, path in by_age:
+                if total <= self.max_bytes:
+                    break
+                total -= self._sizes.pop(path, 0)
+                evicted += 1
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        logger.debug("HTTP cache evicted %d entries", evicted)
+
+    def _remove(self, path: str):
+        with self._lock:
+            self._sizes.pop(path, None)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def summary(self) -> str:
+        return f"{self.hits} fresh hits, {self.revalidated} revalidated (304), {self.misses} misses"
+
+
+_cache: ResponseCache | None = None
+
+
+def configure_cache(directory: str | None, ttl_seconds: float, max_bytes: int) -> ResponseCache | None:
+    """Enable the process-wide cache (directory=None disables it)."""
+    global _cache
+    _cache = ResponseCache(directory, ttl_seconds, max_bytes) if directory else None
+    if _cache:
+        logger.info("HTTP cache enabled at %s (ttl %ss, max %d MB)", directory, ttl_seconds, max_bytes // (1024 * 1024))
+    return _cache
+
+
+def get_cache() -> ResponseCache | None:
+    """The process-wide cache, or None when caching is off."""
+    return _cache
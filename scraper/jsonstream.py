@@ -0,0 +1,107 @@
+"""
+Incremental decoding of one JSON array out of a response stream.
+Large listing APIs return every job (description included) in a single array; decoding it
+item by item keeps peak memory at one chunk plus one item, and lets Stage B start on the
+first jobs while the rest is still downloading.
+"""
+import codecs
+import json
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+class _Reader:
+    """A text buffer over an iterator of str chunks, refilled on demand."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self.eof = True
+            return False
+        # Drop what has been consumed so the buffer only ever holds the current item
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str | None:
+        """Next non-whitespace character (not consumed), or None at end of stream."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return None
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"expected {char!r} at offset {self.pos}, found {found!r}")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number running into the end of the buffer may continue in the next chunk
+            if end == len(self.buf) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_array_items(chunks, path=()):
+    """
+    Yield the items of the array found at path (a sequence of object keys; () for a top-level
+    array) from an iterable of text chunks. Raises ValueError if the document has another shape.
+    """
+    reader = _Reader(chunks)
+    for key in path:
+        reader.expect("{")
+        while True:
+            if reader.peek() == "}":
+                raise ValueError(f"key {key!r} not found")
+            name = reader.value()
+            reader.expect(":")
+            if name == key:
+                break
+            reader.value()  # skip this member
+            if reader.peek() == ",":
+                reader.pos += 1
+    reader.expect("[")
+    if reader.peek() == "]":
+        return
+    while True:
+        yield reader.value()
+        separator = reader.peek()
+        if separator == ",":
+            reader.pos += 1
+        elif separator == "]":
+            return
+        else:
+            raise ValueError(f"expected ',' or ']' at offset {reader.pos}, found {separator!r}")
+
+
+def decode_chunks(byte_chunks, encoding: str | None = None):
+    """Turn an iterable of bytes into text chunks (multi-byte characters may span chunks)."""
+    decoder = codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+    for chunk in byte_chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
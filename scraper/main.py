@@ -2,10 +2,13 @@
 Main scraper runner — orchestrates the two-stage crawl pipeline.
 """
 import argparse
+import heapq
+import itertools
 import logging
 import os
 import sys
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import asdict
 
 # Load .env so REMOTESOURCE_EMAIL / REMOTESOURCE_PASSWORD are available (from scraper dir, any cwd)
@@ -17,9 +20,37 @@ except ImportError:
     pass
 
 from adapters import ALL_ADAPTERS
-from db import finish_crawl, get_db, init_db, log_crawl, upsert_job
+from config import (
+    DETAIL_REFRESH_TTL_HOURS,
+    DETAIL_WORKERS,
+    HTTP_CACHE_DIR,
+    HTTP_CACHE_MAX_BYTES,
+    HTTP_CACHE_TTL_SECONDS,
+    PARALLEL_SOURCES,
+    PARSE_PROCESSES,
+    RESOLVE_APPLY_URLS,
+)
+from db import (
+    finish_crawl,
+    get_db,
+    get_known_jobs,
+    get_recently_refreshed_ids,
+    init_db,
+    log_crawl,
+    set_apply_url_finals,
+    touch_jobs,
+    upsert_job,
+    write_transaction,
+)
+from headless import shutdown_browser
+from httpcache import configure_cache, get_cache
+from parsepool import configure_parse_pool, get_parse_pool, shutdown_parse_pool
+from recorder import RECORD, REPLAY, configure_recorder, get_recorder
+from redirects import get_apply_url_resolver
+from retry import RetryLater, deferred_retries
+from transport import get_wire_stats
 from pipeline.deduper import check_duplicate
-from pipeline.normalizer import normalize_job
+from pipeline.normalizer import normalize_date, normalize_job
 from pipeline.quality import passes_quality
 
 logging.basicConfig(
@@ -30,10 +61,199 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def run_source(adapter_class, max_details: int = 100):
-    """Run the full two-stage pipeline for a single source."""
+def _crawl_and_normalize(adapter, listing):
+    """
+    Stage B worker: fetch one detail page and normalize it. Never touches the DB.
+    With a parse pool, the page is fetched here and parsed + normalized in a worker process.
+    """
+    pool = get_parse_pool()
+    if pool is None or not adapter.splits_detail():
+        detail = adapter.crawl_detail(listing)
+        return normalize_job(detail) if detail else None
+    detail = adapter.detail_from_listing(listing)
+    if detail:
+        return normalize_job(detail)
+    html = adapter.fetch_detail_html(listing)
+    if not html:
+        return None
+    return pool.parse(adapter, listing, html)
+
+
+def _crawl_batch(adapter, batch, attempt: int = 0):
+    """
+    Stage B task for a batch of listings (one listing unless the source renders details in the
+    headless page pool). Returns [(listing, job_data or None or the exception raised)];
+    a RetryLater result means the listing should be re-queued.
+    """
+    adapter.prefetch_details(batch)
+    results = []
+    with deferred_retries(attempt):
+        for listing in batch:
+            try:
+                results.append((listing, _crawl_and_normalize(adapter, listing)))
+            except Exception as e:
+                results.append((listing, e))
+    return results
+
+
+def _resolve_apply_urls(conn, adapter, unresolved: dict[str, str]):
+    """
+    Post-pass after Stage B: follow the apply links of the jobs just stored (source_job_id ->
+    apply_url_original, all still unresolved) in one concurrent batch and store where they land.
+    Links on the source's own site are skipped: they are job pages, not redirects.
+    """
+    source = adapter.name
+    urls = {job_id: url for job_id, url in unresolved.items() if not adapter.is_own_url(url)}
+    if not urls:
+        return
+    logger.info(f"[{source}] Resolving {len(urls)} apply URLs...")
+    try:
+        final = get_apply_url_resolver().resolve_many(urls.values())
+    except Exception as e:
+        logger.warning(f"[{source}] Apply URL resolution failed: {e}")
+        return
+    changed = {job_id: final[url] for job_id, url in urls.items() if final.get(url, url) != url}
+    if changed:
+        with write_transaction(conn):
+            set_apply_url_finals(conn, source, changed)
+
+
+def _unchanged_ids(conn, source: str, listings) -> set[str]:
+    """
+    Ids of the listings already stored with the same title and, where the listing has them,
+    company and posted date (the early-stop signal for incremental runs).
+    """
+    stored = get_known_jobs(conn, source, [l.source_job_id for l in listings])
+
+    def same(a, b) -> bool:
+        return " ".join(str(a or "").split()).casefold() == " ".join(str(b or "").split()).casefold()
+
+    unchanged = set()
+    for listing in listings:
+        row = stored.get(str(listing.source_job_id))
+        if row is None or not same(listing.title, row["title"]):
+            continue
+        if listing.company and not same(listing.company, row["company_name"]):
+            continue
+        if listing.posted_date and normalize_date(listing.posted_date) != row["posted_at"]:
+            continue
+        unchanged.add(str(listing.source_job_id))
+    return unchanged
+
+
+def _store_job(conn, source: str, listing, job_data: dict, stats: dict) -> bool:
+    """
+    Quality-check, dedupe and upsert one normalized job, updating stats in place. Returns
+    whether it was stored. An apply URL resolved by an earlier run is kept while the job's
+    apply_url_original is unchanged.
+    Call inside write_transaction so the dedupe lookup and the write are atomic across sources.
+    """
+    # Quality check
+    passes, reason = passes_quality(job_data)
+    if not passes:
+        stats["quality_rejected"] += 1
+        logger.debug(f"[{source}] Quality rejected: {reason} — {listing.title}")
+        return False
+
+    # Check if this is an update or new
+    existing = conn.execute(
+        "SELECT id, apply_url_original, apply_url_final FROM jobs WHERE source = ? AND source_job_id = ?",
+        (source, listing.source_job_id),
+    ).fetchone()
+
+    # Dedupe check (a job re-fetched from its own source is an update, not a duplicate of itself)
+    dup = check_duplicate(conn, job_data, exclude_id=existing["id"] if existing else None)
+    if dup:
+        stats["duplicates"] += 1
+        return False
+
+    if existing and existing["apply_url_final"] and existing["apply_url_original"] == job_data.get("apply_url_original"):
+        job_data["apply_url_final"] = existing["apply_url_final"]
+
+    # Upsert
+    upsert_job(conn, job_data)
+
+    if existing:
+        stats["jobs_updated"] += 1
+    else:
+        stats["jobs_new"] += 1
+    return True
+
+
+class _DetailScheduler:
+    """
+    Stage B driver: runs _crawl_batch tasks on the pool and hands each finished listing to
+    on_result(listing, job_data) on the calling thread (which owns the DB writes).
+    Retryable failures come back as RetryLater and wait in a timed heap (ready time, tiebreak,
+    listing, next attempt) instead of sleeping in a worker thread.
+    """
+
+    def __init__(self, adapter, pool, on_result, stats: dict):
+        self.adapter = adapter
+        self.pool = pool
+        self.on_result = on_result
+        self.stats = stats
+        self.batch_size = adapter.detail_batch_size()
+        self.pending = {}
+        self.retry_queue = []
+        self._tiebreak = itertools.count()
+
+    def submit(self, listings: list, attempt: int = 0):
+        for i in range(0, len(listings), self.batch_size):
+            batch = listings[i:i + self.batch_size]
+            self.pending[self.pool.submit(_crawl_batch, self.adapter, batch, attempt)] = attempt
+
+    def poll(self, block: bool = True):
+        """Handle whatever has finished; with block=True wait for at least one result or retry."""
+        while self.retry_queue and self.retry_queue[0][0] <= time.monotonic():
+            _, _, listing, attempt = heapq.heappop(self.retry_queue)
+            self.submit([listing], attempt)
+        next_retry = max(0.0, self.retry_queue[0][0] - time.monotonic()) if self.retry_queue else None
+        if not self.pending:
+            if block and next_retry is not None:
+                time.sleep(next_retry)
+            return
+        timeout = next_retry if block else 0
+        done, _ = wait(self.pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            attempt = self.pending.pop(future)
+            for listing, job_data in future.result():
+                if isinstance(job_data, RetryLater):
+                    self.stats["retried"] += 1
+                    logger.info(f"[{self.adapter.name}] {job_data}")
+                    heapq.heappush(
+                        self.retry_queue,
+                        (time.monotonic() + job_data.delay, next(self._tiebreak), listing, attempt + 1),
+                    )
+                else:
+                    self.on_result(listing, job_data)
+
+    def drain(self):
+        while self.pending or self.retry_queue:
+            self.poll(block=True)
+
+
+def run_source(
+    adapter_class,
+    max_details: int = 100,
+    detail_workers: int | None = None,
+    incremental: bool = False,
+    refresh_ttl_hours: float = DETAIL_REFRESH_TTL_HOURS,
+    resolve_apply_urls: bool = RESOLVE_APPLY_URLS,
+):
+    """
+    Run the full two-stage pipeline for a single source.
+    Listings stream from adapter.iter_listing_batches() straight into Stage B, so detail
+    fetches start as soon as the first listing page arrives.
+    With incremental=True, listings whose details were stored within refresh_ttl_hours skip
+    Stage B (they only get last_checked_at bumped), so the detail budget goes to new jobs, and
+    paginated sources stop paging once they reach jobs already stored.
+    With resolve_apply_urls=True, apply links of the stored jobs are followed to their final
+    URL once Stage B is done (see _resolve_apply_urls).
+    """
     adapter = adapter_class()
     source = adapter.name
+    workers = max(1, detail_workers or adapter.DETAIL_WORKERS or DETAIL_WORKERS)
     logger.info(f"{'='*60}")
     logger.info(f"Starting crawl for: {source}")
     logger.info(f"{'='*60}")
@@ -45,105 +265,138 @@ def run_source(adapter_class, max_details: int = 100):
         "jobs_updated": 0,
         "duplicates": 0,
         "quality_rejected": 0,
+        "skipped_fresh": 0,
+        "retried": 0,
         "errors": 0,
     }
 
     with get_db() as conn:
-        crawl_id = log_crawl(conn, source, "full")
+        with write_transaction(conn):
+            crawl_id = log_crawl(conn, source, "full")
+
+        processed = 0
+        queued = 0
+        # source_job_id -> apply URL of stored jobs whose link hasn't been resolved yet
+        unresolved: dict[str, str] = {}
+
+        def _handle(listing, job_data):
+            """Store one Stage B result. Runs on this thread: quality, dedupe and DB writes stay here."""
+            nonlocal processed
+            processed += 1
+            try:
+                if isinstance(job_data, Exception):
+                    raise job_data
+                if not job_data:
+                    stats["errors"] += 1
+                    return
+
+                stats["details_fetched"] += 1
+                with write_transaction(conn):
+                    stored = _store_job(conn, source, listing, job_data, stats)
+                original = job_data.get("apply_url_original")
+                if stored and resolve_apply_urls and original and job_data.get("apply_url_final") == original:
+                    unresolved[str(job_data["source_job_id"])] = original
+
+                if processed % 10 == 0:
+                    logger.info(f"[{source}] Progress: {processed}/{queued}")
+
+            except Exception as e:
+                stats["errors"] += 1
+                logger.error(f"[{source}] Error processing {listing.url}: {e}")
+
+        if incremental:
+            # Lets paginated adapters stop at the first page of jobs we already have
+            adapter.unchanged_ids = lambda listings: _unchanged_ids(conn, source, listings)
 
         try:
-            # Stage A: Listings crawl
-            logger.info(f"[{source}] Stage A: Discovering listings...")
-            listings = adapter.crawl_listings()
-            stats["listings_found"] = len(listings)
-            logger.info(f"[{source}] Found {len(listings)} listings")
-
-            if not listings:
-                logger.warning(f"[{source}] No listings found! Possible site change.")
-                finish_crawl(conn, crawl_id, error_message="No listings found")
-                return stats
-
-            # Stage B: Detail crawl (limit for sanity)
-            detail_count = min(len(listings), max_details)
-            logger.info(f"[{source}] Stage B: Fetching details for {detail_count} jobs...")
-
-            for i, listing in enumerate(listings[:detail_count]):
-                try:
-                    detail = adapter.crawl_detail(listing)
-                    if not detail:
-                        stats["errors"] += 1
-                        continue
-
-                    stats["details_fetched"] += 1
-
-                    # Normalize
-                    job_data = normalize_job(detail)
-
-                    # Quality check
-                    passes, reason = passes_quality(job_data)
-                    if not passes:
-                        stats["quality_rejected"] += 1
-                        logger.debug(f"[{source}] Quality rejected: {reason} — {listing.title}")
-                        continue
-
-                    # Dedupe check
-                    dup = check_duplicate(conn, job_data)
-                    if dup:
-                        stats["duplicates"] += 1
-                        continue
-
-                    # Check if this is an update or new
-                    existing = conn.execute(
-                        "SELECT id FROM jobs WHERE source = ? AND source_job_id = ?",
-                        (source, listing.source_job_id),
-                    ).fetchone()
-
-                    # Upsert
-                    upsert_job(conn, job_data)
-
-                    if existing:
-                        stats["jobs_updated"] += 1
-                    else:
-                        stats["jobs_new"] += 1
-
-                    if (i + 1) % 10 == 0:
-                        logger.info(f"[{source}] Progress: {i+1}/{detail_count}")
-
-                except Exception as e:
-                    stats["errors"] += 1
-                    logger.error(f"[{source}] Error processing {listing.url}: {e}")
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{source}-detail") as pool:
+                scheduler = _DetailScheduler(adapter, pool, _handle, stats)
+
+                # Stage A: Listings crawl. Each batch goes to Stage B (limited to max_details
+                # for sanity) as soon as it arrives.
+                logger.info(f"[{source}] Stage A: Discovering listings ({workers} detail workers)...")
+                for listings in adapter.iter_listing_batches():
+                    stats["listings_found"] += len(listings)
+                    if incremental and listings:
+                        fresh = get_recently_refreshed_ids(
+                            conn, source, [l.source_job_id for l in listings], refresh_ttl_hours
+                        )
+                        if fresh:
+                            with write_transaction(conn):
+                                touch_jobs(conn, source, fresh)
+                            listings = [l for l in listings if str(l.source_job_id) not in fresh]
+                            stats["skipped_fresh"] += len(fresh)
+                    to_crawl = listings[:max(0, max_details - queued)]
+                    queued += len(to_crawl)
+                    scheduler.submit(to_crawl)
+                    scheduler.poll(block=False)
+                logger.info(f"[{source}] Found {stats['listings_found']} listings")
+
+                if not stats["listings_found"]:
+                    logger.warning(f"[{source}] No listings found! Possible site change.")
+                    with write_transaction(conn):
+                        finish_crawl(conn, crawl_id, error_message="No listings found")
+                    return stats
+
+                if incremental:
+                    logger.info(
+                        f"[{source}] Incremental: {stats['skipped_fresh']} jobs refreshed within "
+                        f"{refresh_ttl_hours}h skipped"
+                    )
+                # Stage B: finish the detail fetches still queued
+                logger.info(f"[{source}] Stage B: Fetching details for {queued} jobs...")
+                scheduler.drain()
+
+            if unresolved:
+                _resolve_apply_urls(conn, adapter, unresolved)
 
             # Finish crawl log
-            finish_crawl(
-                conn, crawl_id,
-                jobs_found=stats["listings_found"],
-                jobs_new=stats["jobs_new"],
-                jobs_updated=stats["jobs_updated"],
-                errors=stats["errors"],
-            )
+            with write_transaction(conn):
+                finish_crawl(
+                    conn, crawl_id,
+                    jobs_found=stats["listings_found"],
+                    jobs_new=stats["jobs_new"],
+                    jobs_updated=stats["jobs_updated"],
+                    errors=stats["errors"],
+                )
 
         except Exception as e:
             logger.error(f"[{source}] Fatal error: {e}")
-            finish_crawl(conn, crawl_id, error_message=str(e))
+            with write_transaction(conn):
+                finish_crawl(conn, crawl_id, error_message=str(e))
             stats["errors"] += 1
 
     logger.info(f"[{source}] Results: {stats}")
     return stats
 
 
-def run_all(max_details: int = 50):
-    """Run all source adapters."""
+def run_all(max_details: int = 50, parallel_sources: int = PARALLEL_SOURCES, **source_options):
+    """
+    Run all source adapters. With parallel_sources > 1, sources run concurrently in threads;
+    each source still writes through write_transaction, so jobs.db sees one writer at a time.
+    source_options are passed through to run_source.
+    """
     logger.info("Starting full crawl of all sources...")
     start = time.time()
     all_stats = {}
 
-    for adapter_class in ALL_ADAPTERS:
+    def _run(adapter_class):
         try:
-            stats = run_source(adapter_class, max_details=max_details)
-            all_stats[adapter_class.SOURCE_NAME] = stats
+            return run_source(adapter_class, max_details=max_details, **source_options)
         except Exception as e:
             logger.error(f"Failed to run {adapter_class.SOURCE_NAME}: {e}")
-            all_stats[adapter_class.SOURCE_NAME] = {"error": str(e)}
+            return {"error": str(e)}
+
+    if parallel_sources > 1:
+        logger.info(f"Running up to {parallel_sources} sources in parallel")
+        with ThreadPoolExecutor(max_workers=parallel_sources, thread_name_prefix="source") as pool:
+            results = pool.map(_run, ALL_ADAPTERS)
+            # map preserves ALL_ADAPTERS order, so the summary reads the same as a serial run
+            for adapter_class, stats in zip(ALL_ADAPTERS, results):
+                all_stats[adapter_class.SOURCE_NAME] = stats
+    else:
+        for adapter_class in ALL_ADAPTERS:
+            all_stats[adapter_class.SOURCE_NAME] = _run(adapter_class)
 
     elapsed = time.time() - start
     logger.info(f"\n{'='*60}")
@@ -174,6 +427,70 @@ def main():
         default=50,
         help="Max number of detail pages to fetch per source (default: 50)",
     )
+    parser.add_argument(
+        "--detail-workers",
+        type=int,
+        default=None,
+        help=f"Concurrent detail fetches per source (default: {DETAIL_WORKERS}, or the adapter's own setting)",
+    )
+    parser.add_argument(
+        "--parallel-sources",
+        type=int,
+        default=PARALLEL_SOURCES,
+        metavar="N",
+        help=f"Crawl up to N sources at the same time (default: {PARALLEL_SOURCES})",
+    )
+    parser.add_argument(
+        "--parse-processes",
+        type=int,
+        default=PARSE_PROCESSES,
+        metavar="N",
+        help=f"Parse and normalize detail pages in N worker processes (default: {PARSE_PROCESSES} = in the fetch threads)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Skip detail fetches for jobs refreshed within --refresh-ttl hours (only bump last_checked_at)",
+    )
+    parser.add_argument(
+        "--refresh-ttl",
+        type=float,
+        default=DETAIL_REFRESH_TTL_HOURS,
+        metavar="HOURS",
+        help=f"Incremental mode: re-fetch a job's details after this many hours (default: {DETAIL_REFRESH_TTL_HOURS})",
+    )
+    parser.add_argument(
+        "--resolve-apply-urls",
+        action="store_true",
+        default=RESOLVE_APPLY_URLS,
+        help="After the detail crawl, follow off-site apply links to their final URL (one HEAD/GET per new link, cached)",
+    )
+    parser.add_argument(
+        "--http-cache",
+        nargs="?",
+        const=HTTP_CACHE_DIR,
+        default=None,
+        metavar="DIR",
+        help=f"Cache responses on disk and revalidate them with ETag/Last-Modified (default dir: {HTTP_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--http-cache-ttl",
+        type=int,
+        default=HTTP_CACHE_TTL_SECONDS,
+        metavar="SECONDS",
+        help=f"Serve cached responses without revalidating for this long (default: {HTTP_CACHE_TTL_SECONDS})",
+    )
+    replay_group = parser.add_mutually_exclusive_group()
+    replay_group.add_argument(
+        "--record",
+        metavar="DIR",
+        help="Save every fetched response (HTTP and headless) to DIR for later --replay",
+    )
+    replay_group.add_argument(
+        "--replay",
+        metavar="DIR",
+        help="Serve responses recorded with --record from DIR: no network, no rate-limit sleeps",
+    )
     parser.add_argument(
         "--init-db",
         action="store_true",
@@ -188,11 +505,40 @@ def main():
         logger.info("Database initialized.")
         return
 
-    if args.source:
-        adapter_map = {a.SOURCE_NAME: a for a in ALL_ADAPTERS}
-        run_source(adapter_map[args.source], max_details=args.max_details)
-    else:
-        run_all(max_details=args.max_details)
+    configure_cache(args.http_cache, args.http_cache_ttl, HTTP_CACHE_MAX_BYTES)
+    if args.record:
+        configure_recorder(RECORD, args.record)
+    elif args.replay:
+        configure_recorder(REPLAY, args.replay)
+
+    parse_pool = configure_parse_pool(args.parse_processes)
+
+    source_options = {
+        "detail_workers": args.detail_workers,
+        "incremental": args.incremental,
+        "refresh_ttl_hours": args.refresh_ttl,
+        "resolve_apply_urls": args.resolve_apply_urls,
+    }
+    try:
+        if args.source:
+            adapter_map = {a.SOURCE_NAME: a for a in ALL_ADAPTERS}
+            run_source(adapter_map[args.source], max_details=args.max_details, **source_options)
+        else:
+            run_all(max_details=args.max_details, parallel_sources=args.parallel_sources, **source_options)
+    finally:
+        shutdown_browser()
+        shutdown_parse_pool()
+
+    if get_cache():
+        logger.info(f"HTTP cache: {get_cache().summary()}")
+    if get_recorder():
+        logger.info(f"Record/replay: {get_recorder().summary()}")
+    if args.resolve_apply_urls:
+        logger.info(f"Apply URLs: {get_apply_url_resolver().summary()}")
+    if parse_pool:
+        logger.info(f"Parse pool: {parse_pool.summary()}")
+    if get_wire_stats().requests:
+        logger.info(f"Transfer: {get_wire_stats().summary()}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,89 @@
+"""
+Optional process pool for the CPU half of Stage B.
+Detail threads fetch pages; with a pool configured (--parse-processes N) parsing, extraction
+and normalize_job run in N worker processes instead of in those threads, so a crawl uses every
+core rather than queueing on the GIL. A task carries only the adapter class (pickled by
+reference), the listing's fields and the page text; only the normalized job dict comes back.
+Quality checks, dedupe and DB writes stay in the parent.
+"""
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict
+
+from adapters.base import JobListing
+from pipeline.normalizer import normalize_job
+
+logger = logging.getLogger(__name__)
+
+# Adapter instance per class, created once in each worker process
+_worker_adapters = {}
+
+
+def _parse_in_worker(adapter_class, listing_fields: dict, html: str) -> dict | None:
+    adapter = _worker_adapters.get(adapter_class)
+    if adapter is None:
+        adapter = _worker_adapters[adapter_class] = adapter_class()
+    detail = adapter.parse_detail(JobListing(**listing_fields), html)
+    return normalize_job(detail) if detail else None
+
+
+class ParsePool:
+    """parse() blocks the calling detail thread (without holding the GIL) until a worker is done."""
+
+    def __init__(self, processes: int):
+        self.processes = processes
+        # spawn, not fork: the parent runs detail threads and the browser's event loop thread
+        self._executor = ProcessPoolExecutor(
+            max_workers=processes, mp_context=multiprocessing.get_context("spawn")
+        )
+        self._broken = False
+        self._lock = threading.Lock()
+        self.parsed = 0
+        self.local = 0
+
+    def parse(self, adapter, listing: JobListing, html: str) -> dict | None:
+        """normalize_job(adapter.parse_detail(listing, html)), computed in a worker process."""
+        if not self._broken:
+            try:
+                result = self._executor.submit(_parse_in_worker, type(adapter), asdict(listing), html).result()
+                with self._lock:
+                    self.parsed += 1
+                return result
+            except BrokenProcessPool as e:
+                logger.error("Parse pool died (%s), parsing in the detail threads from now on", e)
+                self._broken = True
+        with self._lock:
+            self.local += 1
+        detail = adapter.parse_detail(listing, html)
+        return normalize_job(detail) if detail else None
+
+    def shutdown(self):
+        self._executor.shutdown(cancel_futures=True)
+
+    def summary(self) -> str:
+        text = f"{self.parsed} pages parsed in {self.processes} processes"
+        return text + (f", {self.local} in threads after the pool failed" if self.local else "")
+
+
+_pool: ParsePool | None = None
+
+
+def configure_parse_pool(processes: int) -> ParsePool | None:
+    """Start the process-wide pool (processes <= 0 leaves parsing in the detail threads)."""
+    global _pool
+    _pool = ParsePool(processes) if processes > 0 else None
+    return _pool
+
+
+def get_parse_pool() -> ParsePool | None:
+    return _pool
+
+
+def shutdown_parse_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
@@ -8,9 +8,10 @@ from db import check_duplicate_fingerprint
 logger = logging.getLogger(__name__)
 
 
-def check_duplicate(conn, job_data: dict) -> dict | None:
+def check_duplicate(conn, job_data: dict, exclude_id: str = None) -> dict | None:
     """
     Check for duplicates using layered approach.
+    exclude_id: the job's own row, when it is already stored.
     Returns the existing duplicate info dict or None.
     """
     # Level 1: Source + source_job_id (handled by UNIQUE constraint in upsert)
@@ -18,7 +19,7 @@ def check_duplicate(conn, job_data: dict) -> dict | None:
     # Level 2: Content fingerprint (same title+company → same job)
     fingerprint = job_data.get("fingerprint_hash")
     if fingerprint:
-        dup = check_duplicate_fingerprint(conn, fingerprint)
+        dup = check_duplicate_fingerprint(conn, fingerprint, exclude_id)
         if dup:
             logger.info(
                 f"Duplicate (fingerprint): '{job_data.get('title')}' matches job {dup['id']} from {dup['source']}"
@@ -37,7 +37,7 @@ def normalize_job(detail: JobDetail) -> dict:
         "salary_currency": str(detail.salary_currency or "USD"),
         "salary_period": str(detail.salary_period or "yearly"),
         "salary_text": str(detail.salary_text or ""),
-        "posted_at": _normalize_date(detail.posted_at),
+        "posted_at": normalize_date(detail.posted_at),
         "apply_url_original": str(detail.apply_url_original or ""),
         "apply_url_final": str(detail.apply_url_final or ""),
         "canonical_url": str(detail.canonical_url or ""),
@@ -69,11 +69,15 @@ def _clean_title(title: str) -> str:
     return title
 
 
-def _normalize_date(date_val) -> str:
+def normalize_date(date_val) -> str:
     """Normalize date string to ISO format."""
     if not date_val:
         return datetime.now(timezone.utc).isoformat()
 
+    # Integer timestamps that arrive as strings (e.g. Himalayas pubDate)
+    if isinstance(date_val, str) and date_val.strip().isdigit():
+        date_val = int(date_val.strip())
+
     # Handle integer timestamps
     if isinstance(date_val, (int, float)):
         try:
@@ -0,0 +1,247 @@
+"""
+Process-wide per-domain rate limiter.
+One token bucket per host, shared by every adapter instance and worker thread, so concurrent
+detail workers and parallel sources never exceed a domain's budget between them.
+Honors a robots.txt Crawl-delay when the site publishes one.
+
+Alongside the rate, an AIMD window caps how many requests may be in flight per host and
+adapts it from what each response looks like (see DomainConcurrency).
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+from config import (
+    AIMD_DECREASE_FACTOR,
+    AIMD_INCREASE_AFTER,
+    AIMD_INITIAL_CONCURRENCY,
+    AIMD_MAX_CONCURRENCY,
+    AIMD_MIN_CONCURRENCY,
+    AIMD_SLOW_RESPONSE_SECONDS,
+    DOMAIN_RATE_LIMITS,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_SECONDS,
+    RESPECT_ROBOTS_CRAWL_DELAY,
+    USER_AGENTS,
+)
+from transport import new_session
+
+logger = logging.getLogger(__name__)
+
+ROBOTS_TIMEOUT = 10
+
+
+def host_of(url: str) -> str:
+    """Lowercased host (with port, if any) used as the limiter key."""
+    return urlsplit(url).netloc.lower()
+
+
+class TokenBucket:
+    """Classic token bucket. Tokens may go negative: that is the queue of reserved slots."""
+
+    def __init__(self, interval: float, burst: int = 1):
+        self.interval = max(float(interval), 0.0)
+        self.burst = max(int(burst), 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token. Returns how many seconds the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            if self.interval <= 0:
+                return 0.0
+            refill = (now - self._updated) / self.interval
+            self._tokens = min(float(self.burst), self._tokens + refill)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens * self.interval
+
+
+class DomainRateLimiter:
+    """Token buckets keyed by host, created lazily on first request to each host."""
+
+    def __init__(self):
+        self._buckets: dict[str, TokenBucket] = {}
+        self._overrides: dict[str, tuple[float, int]] = dict(DOMAIN_RATE_LIMITS)
+        self._lock = threading.Lock()
+
+    def configure(self, host: str, interval: float | None = None, burst: int | None = None):
+        """Per-source override for one host. Replaces the bucket if it already exists."""
+        host = host.lower()
+        default_interval, default_burst = self._overrides.get(host, (RATE_LIMIT_SECONDS, RATE_LIMIT_BURST))
+        settings = (
+            default_interval if interval is None else interval,
+            default_burst if burst is None else burst,
+        )
+        with self._lock:
+            self._overrides[host] = settings
+            self._buckets.pop(host, None)
+
+    def acquire(self, url: str) -> float:
+        """Block until a request to url's host is allowed. Returns seconds waited."""
+        host = host_of(url)
+        if not host:
+            return 0.0
+        wait = self._bucket(url, host).reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def _bucket(self, url: str, host: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket:
+                return bucket
+            interval, burst = self._overrides.get(host, (RATE_LIMIT_SECONDS, RATE_LIMIT_BURST))
+
+        # Network call outside the lock; a duplicate robots fetch on a race is harmless
+        crawl_delay = _robots_crawl_delay(url) if RESPECT_ROBOTS_CRAWL_DELAY else None
+        if crawl_delay and crawl_delay > interval:
+            logger.info("robots.txt for %s asks for Crawl-delay %ss (configured %ss)", host, crawl_delay, interval)
+            interval, burst = crawl_delay, 1
+
+        with self._lock:
+            return self._buckets.setdefault(host, TokenBucket(interval, burst))
+
+
+def _robots_crawl_delay(url: str) -> float | None:
+    """Crawl-delay from the host's robots.txt, or None if absent/unreachable."""
+    parts = urlsplit(url)
+    robots_url = f"{parts.scheme or 'https'}://{parts.netloc}/robots.txt"
+    try:
+        resp = new_session(USER_AGENTS[0]).get(robots_url, timeout=ROBOTS_TIMEOUT)
+        if resp.status_code != 200:
+            return None
+        parser = RobotFileParser()
+        parser.parse(resp.text.splitlines())
+        delay = parser.crawl_delay("*")
+        return float(delay) if delay else None
+    except Exception as e:
+        logger.debug("Could not read %s: %s", robots_url, e)
+        return None
+
+
+# Statuses that mean "you are going too fast" rather than "this URL is bad"
+CONGESTION_STATUSES = {429, 503}
+
+
+class AdaptiveWindow:
+    """
+    AIMD concurrency window for one host.
+    Congestion multiplies the window by AIMD_DECREASE_FACTOR (once per round: requests that
+    started before the last decrease can't shrink it again); a run of clean responses adds one.
+    """
+
+    def __init__(self, host: str):
+        self.host = host
+        self.limit = float(AIMD_INITIAL_CONCURRENCY)
+        self.in_flight = 0
+        self._successes = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> float:
+        """Block until the window has room. Returns the start time to pass to release()."""
+        with self._cond:
+            while self.in_flight >= max(int(self.limit), 1):
+                self._cond.wait()
+            self.in_flight += 1
+            return time.monotonic()
+
+    def release(self, started: float, outcome: str, reason: str = ""):
+        """outcome is "ok", "congested" or "neutral" (failures that say nothing about load)."""
+        with self._cond:
+            self.in_flight -= 1
+            old = int(self.limit)
+            if outcome == "congested" and started >= self._last_decrease:
+                self.limit = max(float(AIMD_MIN_CONCURRENCY), self.limit * AIMD_DECREASE_FACTOR)
+                self._last_decrease = time.monotonic()
+                self._successes = 0
+                logger.info("[aimd] %s: window %d -> %d (%s)", self.host, old, int(self.limit), reason)
+            elif outcome == "ok":
+                self._successes += 1
+                if self._successes >= AIMD_INCREASE_AFTER and self.limit < AIMD_MAX_CONCURRENCY:
+                    self.limit = min(float(AIMD_MAX_CONCURRENCY), self.limit + 1)
+                    self._successes = 0
+                    logger.info(
+                        "[aimd] %s: window %d -> %d (%d clean responses)",
+                        self.host, old, int(self.limit), AIMD_INCREASE_AFTER,
+                    )
+            self._cond.notify_all()
+
+
+class RequestSlot:
+    """Handed out by DomainConcurrency.slot(); the caller records the response status on it."""
+
+    def __init__(self):
+        self.status: int | None = None
+
+    def record(self, status: int | None):
+        self.status = status
+
+
+class DomainConcurrency:
+    """AIMD windows keyed by host, created lazily."""
+
+    def __init__(self):
+        self._windows: dict[str, AdaptiveWindow] = {}
+        self._lock = threading.Lock()
+
+    def window(self, host: str) -> AdaptiveWindow:
+        with self._lock:
+            if host not in self._windows:
+                self._windows[host] = AdaptiveWindow(host)
+            return self._windows[host]
+
+    @contextmanager
+    def slot(self, url: str, limiter: DomainRateLimiter | None = None):
+        """
+        Hold one in-flight slot for url's host for the duration of a request, then (if given)
+        wait for a rate-limit token. Timeouts/connection errors raised inside the block and
+        429/503/slow responses recorded on the slot shrink the window.
+        """
+        window = self.window(host_of(url))
+        started = window.acquire()
+        slot = RequestSlot()
+        outcome, reason = "neutral", ""
+        try:
+            if limiter:
+                limiter.acquire(url)
+                started = time.monotonic()  # latency excludes the rate-limit wait
+            yield slot
+        except (requests.Timeout, requests.ConnectionError) as e:
+            outcome, reason = "congested", type(e).__name__
+            raise
+        else:
+            latency = time.monotonic() - started
+            if slot.status in CONGESTION_STATUSES:
+                outcome, reason = "congested", f"HTTP {slot.status}"
+            elif latency > AIMD_SLOW_RESPONSE_SECONDS:
+                outcome, reason = "congested", f"slow response {latency:.1f}s"
+            elif slot.status is not None and slot.status < 400:
+                outcome = "ok"
+        finally:
+            window.release(started, outcome, reason)
+
+
+_limiter = DomainRateLimiter()
+_concurrency = DomainConcurrency()
+
+
+def get_rate_limiter() -> DomainRateLimiter:
+    """Per-host token buckets every request waits on, so parallel workers share one budget."""
+    return _limiter
+
+
+def get_concurrency() -> DomainConcurrency:
+    """Per-host caps on requests in flight, narrowed when a host pushes back."""
+    return _concurrency
@@ -0,0 +1,113 @@
+"""
+Record/replay of fetched pages for fully offline crawls.
+With --record DIR every response that passes through BaseAdapter.fetch / fetch_json and the
+headless fetchers is saved to DIR; with --replay DIR those responses are served back with no
+network and no rate-limit sleeps, so parse/normalize/DB stages can be profiled in isolation
+and production runs reproduced on a laptop.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+
+from httpcache import CachedResponse
+
+logger = logging.getLogger(__name__)
+
+RECORD = "record"
+REPLAY = "replay"
+
+
+class Recorder:
+    """One gzip'd JSON file per (kind, url). kind separates plain HTTP from headless renders."""
+
+    def __init__(self, mode: str, directory: str):
+        self.mode = mode
+        self.directory = directory
+        self.saved = 0
+        self.served = 0
+        self.missing = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == REPLAY
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == RECORD
+
+    def _path(self, kind: str, url: str) -> str:
+        digest = hashlib.sha256(f"{kind} {url}".encode()).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json.gz")
+
+    def save(self, kind: str, url: str, text: str, status_code: int = 200, headers=None):
+        """Store one response (recording mode only)."""
+        if not self.recording or text is None:
+            return
+        data = {
+            "kind": kind,
+            "url": url,
+            "status_code": status_code,
+            "headers": {k.lower(): v for k, v in (headers or {}).items()},
+            "body": text,
+            "recorded_at": time.time(),
+        }
+        path = self._path(kind, url)
+        tmp = f"{path}.tmp{os.getpid()}"
+        try:
+            with gzip.open(tmp, "wt", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, path)
+            self.saved += 1
+        except OSError as e:
+            logger.warning("Could not record %s: %s", url, e)
+
+    def load(self, kind: str, url: str) -> dict | None:
+        """Recorded response for (kind, url), or None if it was never recorded."""
+        try:
+            with gzip.open(self._path(kind, url), "rt", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            self.missing += 1
+            logger.warning("[replay] No recording for %s %s", kind, url)
+            return None
+        self.served += 1
+        return data
+
+    def load_text(self, kind: str, url: str) -> str | None:
+        data = self.load(kind, url)
+        return data["body"] if data else None
+
+    def load_response(self, kind: str, url: str) -> CachedResponse | None:
+        data = self.load(kind, url)
+        if not data:
+            return None
+        return CachedResponse(data["body"], data.get("status_code", 200), data.get("url", url), data.get("headers"))
+
+    def summary(self) -> str:
+        if self.recording:
+            return f"recorded {self.saved} responses to {self.directory}"
+        return f"replayed {self.served} responses from {self.directory} ({self.missing} missing)"
+
+
+_recorder: Recorder | None = None
+
+
+def configure_recorder(mode: str | None, directory: str | None) -> Recorder | None:
+    """Turn on recording or replay for this process (mode=None turns both off)."""
+    global _recorder
+    _recorder = Recorder(mode, directory) if mode and directory else None
+    if _recorder:
+        logger.info("%s mode: %s", mode.capitalize(), directory)
+    return _recorder
+
+
+def get_recorder() -> Recorder | None:
+    return _recorder
+
+
+def replaying() -> bool:
+    return bool(_recorder and _recorder.replaying)
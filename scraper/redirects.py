@@ -0,0 +1,126 @@
+"""
+Batch apply-URL resolution.
+Apply links are often tracking redirects (ATS short links, utm bouncers). ApplyUrlResolver
+follows the redirect chains of many URLs at once, each request under the shared per-host
+limiter and AIMD window, and caches url -> final url in the apply_url_cache table so links
+seen within APPLY_URL_TTL_HOURS are not resolved again. main.run_source calls it once per
+source, after Stage B, for the stored jobs whose links point off the source's site.
+"""
+import logging
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from config import APPLY_RESOLVE_WORKERS, APPLY_URL_TTL_HOURS, USER_AGENTS
+from db import get_db, get_resolved_urls, save_resolved_urls, write_transaction
+from ratelimit import get_concurrency, get_rate_limiter
+from recorder import get_recorder
+from transport import new_session
+
+logger = logging.getLogger(__name__)
+
+RESOLVE_TIMEOUT = 10
+MAX_REDIRECTS = 10
+
+
+class ApplyUrlResolver:
+    """Follows apply links to where they land, a batch at a time on its own worker pool."""
+
+    def __init__(self, workers: int = APPLY_RESOLVE_WORKERS, ttl_hours: float = APPLY_URL_TTL_HOURS):
+        self.workers = max(1, workers)
+        self.ttl_hours = ttl_hours
+        self.session = new_session(USER_AGENTS[0])
+        self.session.max_redirects = MAX_REDIRECTS
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="apply-resolve")
+        self._lock = threading.Lock()
+        self.cached = 0
+        self.resolved = 0
+        self.failed = 0
+
+    def resolve_many(self, urls) -> dict[str, str]:
+        """
+        Final URL for each http(s) url (the url itself when it doesn't redirect or can't be
+        reached). Cached results within the TTL are reused; the rest are resolved concurrently.
+        """
+        urls = list(dict.fromkeys(u for u in urls if u and u.startswith(("http://", "https://"))))
+        if not urls:
+            return {}
+        recorder = get_recorder()
+        if recorder and recorder.replaying:
+            return {u: recorder.load_text("redirect", u) or u for u in urls}
+
+        results = self._cached(urls)
+        missing = [u for u in urls if u not in results]
+        if missing:
+            resolved = dict(zip(missing, self._pool.map(self._resolve_one, missing)))
+            self._save({u: final for u, final in resolved.items() if final})
+            results.update({u: final or u for u, final in resolved.items()})
+        return results
+
+    def resolve(self, url: str) -> str:
+        return self.resolve_many([url]).get(url, url)
+
+    def _cached(self, urls: list[str]) -> dict[str, str]:
+        try:
+            with get_db() as conn:
+                found = get_resolved_urls(conn, urls, self.ttl_hours)
+        except sqlite3.Error as e:
+            logger.debug("Apply URL cache unavailable: %s", e)
+            return {}
+        with self._lock:
+            self.cached += len(found)
+        return found
+
+    def _save(self, resolved: dict[str, str]):
+        if not resolved:
+            return
+        try:
+            with get_db() as conn, write_transaction(conn):
+                save_resolved_urls(conn, resolved)
+        except sqlite3.Error as e:
+            logger.warning("Could not cache %d resolved apply URLs: %s", len(resolved), e)
+
+    def _resolve_one(self, url: str) -> str | None:
+        """Follow url's redirect chain. None when it couldn't be resolved (not cached)."""
+        try:
+            with get_concurrency().slot(url, get_rate_limiter()) as slot:
+                resp = self.session.head(url, timeout=RESOLVE_TIMEOUT, allow_redirects=True)
+                slot.record(resp.status_code)
+            if resp.status_code in (405, 501):
+                # Some servers refuse HEAD; a streamed GET follows the same chain without the body
+                with get_concurrency().slot(url, get_rate_limiter()) as slot:
+                    resp = self.session.get(
+                        url, timeout=RESOLVE_TIMEOUT, allow_redirects=True, stream=True
+                    )
+                    slot.record(resp.status_code)
+                resp.close()
+            final = resp.url
+        except requests.RequestException as e:
+            logger.debug("Could not resolve %s: %s", url, e)
+            with self._lock:
+                self.failed += 1
+            return None
+        with self._lock:
+            self.resolved += 1
+        recorder = get_recorder()
+        if recorder:
+            recorder.save("redirect", url, final)
+        return final
+
+    def summary(self) -> str:
+        return f"{self.resolved} resolved, {self.cached} from cache, {self.failed} failed"
+
+
+_resolver: ApplyUrlResolver | None = None
+_resolver_lock = threading.Lock()
+
+
+def get_apply_url_resolver() -> ApplyUrlResolver:
+    """Apply-URL resolver with its own session and thread pool (created on first use)."""
+    global _resolver
+    with _resolver_lock:
+        if _resolver is None:
+            _resolver = ApplyUrlResolver()
+        return _resolver
@@ -0,0 +1,150 @@
+"""
+Retry policy shared by every adapter.
+Failures are classified as retryable (timeouts, connection errors, 408/425/429/5xx) or not
+(other 4xx: the URL will never work), delays use full-jitter exponential backoff and honor
+Retry-After, and a per-host circuit breaker stops a dead host from eating the run's time.
+
+Stage B workers run inside deferred_retries(): instead of sleeping through the backoff,
+fetch raises RetryLater and the scheduler in main.run_source re-queues the listing.
+"""
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+
+import requests
+
+from config import (
+    CIRCUIT_COOLDOWN_SECONDS,
+    CIRCUIT_FAILURE_THRESHOLD,
+    MAX_RETRIES,
+    RETRY_AFTER_MAX_SECONDS,
+    RETRY_BACKOFF,
+)
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+
+class RetryLater(Exception):
+    """Raised by fetch in deferred mode: try url again after delay seconds."""
+
+    def __init__(self, url: str, delay: float, reason: str):
+        super().__init__(f"{reason}; retry {url} in {delay:.1f}s")
+        self.url = url
+        self.delay = delay
+        self.reason = reason
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether another attempt at the same URL could succeed."""
+    if isinstance(error, requests.HTTPError):
+        return error.response is not None and error.response.status_code in RETRYABLE_STATUSES
+    return isinstance(error, (requests.Timeout, requests.ConnectionError, requests.exceptions.ChunkedEncodingError))
+
+
+def retry_after_seconds(error: Exception) -> float | None:
+    """Retry-After from the failed response (delta-seconds or HTTP-date), capped, or None."""
+    response = getattr(error, "response", None)
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), RETRY_AFTER_MAX_SECONDS)
+
+
+def backoff_delay(attempt: int, error: Exception | None = None) -> float:
+    """Full-jitter backoff for the given 0-based attempt, never shorter than Retry-After."""
+    delay = random.uniform(0, RETRY_BACKOFF ** (attempt + 1))
+    retry_after = retry_after_seconds(error) if error is not None else None
+    return max(delay, retry_after or 0.0)
+
+
+class CircuitBreaker:
+    """
+    Per-host breaker. CIRCUIT_FAILURE_THRESHOLD retryable failures in a row open it; while open,
+    requests to the host fail fast. After CIRCUIT_COOLDOWN_SECONDS one trial request is let
+    through (half-open): success closes the breaker, failure re-opens it.
+    """
+
+    def __init__(self):
+        self._failures: dict[str, int] = {}
+        self._opened_at: dict[str, float] = {}
+        self._trial: set[str] = set()
+        self._lock = threading.Lock()
+
+    def allow(self, host: str) -> bool:
+        with self._lock:
+            opened = self._opened_at.get(host)
+            if opened is None:
+                return True
+            if time.monotonic() - opened < CIRCUIT_COOLDOWN_SECONDS or host in self._trial:
+                return False
+            self._trial.add(host)
+            logger.info("[circuit] %s: half-open, sending one trial request", host)
+            return True
+
+    def is_open(self, host: str) -> bool:
+        with self._lock:
+            return host in self._opened_at
+
+    def record_success(self, host: str):
+        with self._lock:
+            self._failures.pop(host, None)
+            self._trial.discard(host)
+            if self._opened_at.pop(host, None) is not None:
+                logger.info("[circuit] %s: closed", host)
+
+    def record_failure(self, host: str):
+        with self._lock:
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            reopen = host in self._trial
+            self._trial.discard(host)
+            if reopen or (failures >= CIRCUIT_FAILURE_THRESHOLD and host not in self._opened_at):
+                self._opened_at[host] = time.monotonic()
+                logger.warning(
+                    "[circuit] %s: open after %d consecutive failures, failing fast for %ss",
+                    host, failures, CIRCUIT_COOLDOWN_SECONDS,
+                )
+
+
+_breaker = CircuitBreaker()
+_deferred = threading.local()
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """Per-host failure tracking that makes requests to a failing host return None at once."""
+    return _breaker
+
+
+@contextmanager
+def deferred_retries(attempt: int = 0):
+    """
+    Within the block, fetch makes a single attempt (numbered `attempt`) and raises RetryLater
+    for retryable failures instead of sleeping, while attempts remain.
+    """
+    previous = getattr(_deferred, "attempt", None)
+    _deferred.attempt = attempt
+    try:
+        yield
+    finally:
+        _deferred.attempt = previous
+
+
+def deferred_attempt() -> int | None:
+    """The attempt number when the calling thread is inside deferred_retries(), else None."""
+    return getattr(_deferred, "attempt", None)
+
+
+def attempts_left(attempt: int) -> bool:
+    return attempt < MAX_RETRIES - 1
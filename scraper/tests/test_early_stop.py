@@ -0,0 +1,31 @@
+"""EarlyStop: paging stops only on an unbroken run of unchanged pages from the first one."""
+import unittest
+
+from adapters.base import EarlyStop, JobListing
+
+
+def page(*ids) -> list[JobListing]:
+    return [JobListing(source="example", source_job_id=i, url=f"https://jobs.example.com/{i}") for i in ids]
+
+
+class EarlyStopTest(unittest.TestCase):
+    def setUp(self):
+        self.unchanged = {"a", "b", "c", "d"}
+        self.stopper = EarlyStop(lambda listings: {l.source_job_id for l in listings} & self.unchanged, pages=1)
+
+    def test_later_page_finishing_first_does_not_stop(self):
+        self.assertFalse(self.stopper.should_stop(page("c", "d"), page=2))
+        self.assertFalse(self.stopper.should_stop(page("new", "a"), page=0))
+        self.assertTrue(self.stopper.should_stop(page("b"), page=1))
+
+    def test_changed_job_keeps_paging(self):
+        self.unchanged.discard("a")
+        self.assertFalse(self.stopper.should_stop(page("a", "b"), page=0))
+        self.assertTrue(self.stopper.should_stop(page("c"), page=1))
+
+    def test_full_runs_never_stop(self):
+        self.assertFalse(EarlyStop(None).should_stop(page("a"), page=0))
+
+
+if __name__ == "__main__":
+    unittest.main()
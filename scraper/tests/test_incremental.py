@@ -0,0 +1,88 @@
+"""
+Incremental runs: a job whose details were stored within the refresh TTL skips Stage B.
+Run from scraper/: python -m pytest tests (or python -m unittest discover tests).
+"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import db
+from adapters.base import BaseAdapter, JobDetail, JobListing
+from main import _unchanged_ids, run_source
+
+JOB_URL = "https://jobs.example.com/jobs/1"
+
+
+class OneJobAdapter(BaseAdapter):
+    """Lists one job and counts its detail fetches (no network)."""
+
+    SOURCE_NAME = "example"
+    BASE_URL = "https://jobs.example.com"
+    details_fetched = 0
+
+    def crawl_listings(self) -> list[JobListing]:
+        return [JobListing(source=self.SOURCE_NAME, source_job_id="1", url=JOB_URL, title="Senior Python Developer")]
+
+    def crawl_detail(self, listing: JobListing) -> JobDetail | None:
+        type(self).details_fetched += 1
+        return JobDetail(
+            source=self.SOURCE_NAME,
+            source_job_id=listing.source_job_id,
+            title=listing.title,
+            company_name="Example Inc",
+            description_text="Build and run the Python services behind our job board. " * 3,
+            apply_url_original="https://careers.example.org/apply/1",
+            apply_url_final="https://careers.example.org/apply/1",
+            canonical_url=listing.url,
+        )
+
+
+class IncrementalRefreshTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = mock.patch.object(db, "DB_PATH", os.path.join(tmp.name, "jobs.db"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        db.init_db()
+        OneJobAdapter.details_fetched = 0
+
+    def _age_job(self, hours: int):
+        with db.get_db() as conn:
+            conn.execute("UPDATE jobs SET updated_at = datetime(updated_at, ?)", (f"-{hours} hours",))
+
+    def _run(self) -> dict:
+        return run_source(OneJobAdapter, incremental=True, refresh_ttl_hours=24)
+
+    def test_refetched_job_is_refreshed_not_counted_as_its_own_duplicate(self):
+        self.assertEqual(self._run()["jobs_new"], 1)
+        self._age_job(48)
+
+        stats = self._run()
+        self.assertEqual((stats["details_fetched"], stats["jobs_updated"], stats["duplicates"]), (1, 1, 0))
+        with db.get_db() as conn:
+            fresh = db.get_recently_refreshed_ids(conn, OneJobAdapter.SOURCE_NAME, ["1"], 24)
+        self.assertEqual(fresh, {"1"})
+
+    def test_run_a_day_later_skips_the_refreshed_job(self):
+        self._run()
+        self._age_job(48)
+        self._run()  # stale: fetched again, which refreshes it
+        self._age_job(1)
+
+        stats = self._run()
+        self.assertEqual((stats["skipped_fresh"], stats["details_fetched"]), (1, 0))
+        self.assertEqual(OneJobAdapter.details_fetched, 2)
+
+    def test_early_stop_needs_the_job_unchanged(self):
+        self._run()
+        listing = OneJobAdapter().crawl_listings()[0]
+        with db.get_db() as conn:
+            self.assertEqual(_unchanged_ids(conn, OneJobAdapter.SOURCE_NAME, [listing]), {"1"})
+            listing.title = "Staff Python Developer"
+            self.assertEqual(_unchanged_ids(conn, OneJobAdapter.SOURCE_NAME, [listing]), set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+"""
+HTTP transport shared by every source.
+
+Sessions: all requests.Sessions come from new_session() and mount one HTTPAdapter, so the
+connection pools (sized to the per-host AIMD ceiling) are shared across sources and threads
+and keep-alive connections are reused instead of re-handshaking TLS. Each session keeps one
+User-Agent for its lifetime and advertises every encoding urllib3 can decode (br/zstd when
+brotli/zstandard are installed). WireStats counts compressed bytes actually transferred.
+
+Per-host transport memory: which fetch strategy (plain HTTP or the headless browser) last
+worked for each host, persisted in the host_transport table so the next run starts with it.
+Hosts remembered as headless skip the doomed requests call (and its 403) entirely; once every
+TRANSPORT_REPROBE_HOURS one request re-tries plain HTTP in case the block was lifted.
+"""
+import logging
+import random
+import sqlite3
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+from config import HTTP_POOL_HOSTS, HTTP_POOL_MAXSIZE, TRANSPORT_REPROBE_HOURS, USER_AGENTS
+from db import get_db, write_transaction
+
+logger = logging.getLogger(__name__)
+
+HTTP = "http"
+HEADLESS = "headless"
+
+# One pool per host (up to HTTP_POOL_HOSTS hosts), each holding as many connections as the
+# AIMD window can ever put in flight. Never blocks: overflow connections are just not kept.
+_http_adapter = HTTPAdapter(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=0)
+
+
+def new_session(user_agent: str | None = None) -> requests.Session:
+    """A Session on the shared connection pools with a stable identity (one User-Agent)."""
+    session = requests.Session()
+    session.mount("https://", _http_adapter)
+    session.mount("http://", _http_adapter)
+    session.headers.update({
+        "User-Agent": user_agent or random.choice(USER_AGENTS),
+        "Accept-Encoding": ACCEPT_ENCODING,
+    })
+    return session
+
+
+class WireStats:
+    """Bytes transferred (as sent, i.e. compressed) versus bytes after decoding."""
+
+    def __init__(self):
+        self.requests = 0
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
+        self._lock = threading.Lock()
+
+    def record(self, resp, decoded_bytes: int | None = None):
+        """Count a fully read response. raw.tell() is the number of body bytes read off the socket."""
+        raw = getattr(resp, "raw", None)
+        if raw is None or not hasattr(raw, "tell"):
+            return
+        try:
+            wire = raw.tell()
+        except (OSError, ValueError):
+            return
+        if decoded_bytes is None:
+            decoded_bytes = len(resp.content)
+        with self._lock:
+            self.requests += 1
+            self.wire_bytes += wire
+            self.decoded_bytes += decoded_bytes
+
+    def summary(self) -> str:
+        saved = 1 - self.wire_bytes / self.decoded_bytes if self.decoded_bytes else 0
+        return (
+            f"{self.requests} responses, {self.wire_bytes / 1e6:.1f} MB on the wire for "
+            f"{self.decoded_bytes / 1e6:.1f} MB of content ({saved:.0%} saved by compression)"
+        )
+
+
+_wire_stats = WireStats()
+
+
+def get_wire_stats() -> WireStats:
+    return _wire_stats
+
+
+class TransportMemory:
+    """Strategy per host, loaded from the DB on first use and written through on every change."""
+
+    def __init__(self):
+        self._hosts: dict[str, dict] | None = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict[str, dict]:
+        if self._hosts is None:
+            try:
+                with get_db() as conn:
+                    rows = conn.execute("SELECT host, strategy, probed_at FROM host_transport").fetchall()
+                self._hosts = {r["host"]: {"strategy": r["strategy"], "probed_at": r["probed_at"] or 0} for r in rows}
+            except sqlite3.Error as e:
+                logger.debug("No transport memory available: %s", e)
+                self._hosts = {}
+        return self._hosts
+
+    def strategy(self, host: str) -> str:
+        """Strategy that last worked for host (HTTP if it was never seen)."""
+        with self._lock:
+            return self._load().get(host, {}).get("strategy", HTTP)
+
+    def prefers_headless(self, host: str) -> bool:
+        """
+        True when the next request to host should go straight to the browser. Returns False
+        once per TRANSPORT_REPROBE_HOURS so that one request probes plain HTTP again.
+        """
+        with self._lock:
+            entry = self._load().get(host)
+            if not entry or entry["strategy"] != HEADLESS:
+                return False
+            if time.time() - entry["probed_at"] < TRANSPORT_REPROBE_HOURS * 3600:
+                return True
+            # Claim the probe so concurrent workers keep using the browser meanwhile
+            entry["probed_at"] = time.time()
+        logger.info("[transport] %s: re-probing plain HTTP", host)
+        self._save(host, HEADLESS, entry["probed_at"])
+        return False
+
+    def record(self, host: str, strategy: str):
+        """Remember that strategy just worked for host (persists only when it changed)."""
+        with self._lock:
+            entry = self._load().get(host)
+            if entry and entry["strategy"] == strategy:
+                return
+            probed_at = time.time()
+            self._load()[host] = {"strategy": strategy, "probed_at": probed_at}
+        logger.info("[transport] %s: now using %s", host, strategy)
+        self._save(host, strategy, probed_at)
+
+    def _save(self, host: str, strategy: str, probed_at: float):
+        try:
+            with get_db() as conn, write_transaction(conn):
+                conn.execute(
+                    """INSERT INTO host_transport (host, strategy, probed_at, updated_at)
+                       VALUES (?, ?, ?, datetime('now'))
+                       ON CONFLICT(host) DO UPDATE SET
+                           strategy = excluded.strategy,
+                           probed_at = excluded.probed_at,
+                           updated_at = excluded.updated_at""",
+                    (host, strategy, probed_at),
+                )
+        except sqlite3.Error as e:
+            logger.warning("Could not save transport for %s: %s", host, e)
+
+
+_memory = TransportMemory()
+
+
+def get_transport_memory() -> TransportMemory:
+    """Which transport (plain HTTP or the headless browser) each host gets first."""
+    return _memory